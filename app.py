@@ -76,6 +76,7 @@ with st.sidebar:
     llm_provider = st.selectbox("Proveedor de LLM", ["openai", "google", "anthropic"], index=0)
     deep_think_llm = st.text_input("Modelo Principal (Deep Think)", "gpt-4o")
     quick_think_llm = st.text_input("Modelo Rápido (Quick Think)", "gpt-4o")
+    force_refresh = st.checkbox("Recalcular análisis guardados", value=False)
 
     run_analysis = st.button(f"🚀 Analizar {'Mercados' if len(selected_tickers) > 1 else 'Mercado'}")
 
@@ -126,7 +127,7 @@ if run_analysis:
                     ta = TradingAgentsGraph(debug=False, config=config, selected_analysts=selected_analysts)
                     formatted_date = analysis_date.strftime("%Y-%m-%d")
                     
-                    state, decision = ta.propagate(ticker, formatted_date)
+                    state, decision = ta.propagate(ticker, formatted_date, force_refresh=force_refresh)
 
                     st.success(f"Análisis completado para {ticker} ({asset_type}).")
 
@@ -196,42 +197,64 @@ if run_analysis:
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            for i, ticker in enumerate(selected_tickers):
-                asset_type = detect_asset_type(ticker)
-                status_text.text(f"Analizando {ticker} ({asset_type})... {i+1}/{len(selected_tickers)}")
-                
+            config = DEFAULT_CONFIG.copy()
+            config["llm_provider"] = llm_provider
+            config["deep_think_llm"] = deep_think_llm
+            config["quick_think_llm"] = quick_think_llm
+            config["online_tools"] = True
+            config["max_debate_rounds"] = 1  # Reducir rounds para análisis múltiple
+            config["language"] = "spanish"
+            config["language_instruction"] = "IMPORTANTE: Responde SIEMPRE en español. Todos los análisis, reportes y decisiones deben estar en español."
+            formatted_date = analysis_date.strftime("%Y-%m-%d")
+
+            # Agrupar activos por analistas para reutilizar un solo grafo por grupo
+            asset_types = {ticker: detect_asset_type(ticker) for ticker in selected_tickers}
+            groups = {}
+            for ticker in selected_tickers:
+                analysts = tuple(get_analysts_for_asset(asset_types[ticker]))
+                groups.setdefault(analysts, []).append(ticker)
+
+            completed = 0
+            status_text.text(f"Analizando {len(selected_tickers)} activos en paralelo...")
+            for analysts, tickers in groups.items():
                 try:
-                    config = DEFAULT_CONFIG.copy()
-                    config["llm_provider"] = llm_provider
-                    config["deep_think_llm"] = deep_think_llm
-                    config["quick_think_llm"] = quick_think_llm
-                    config["online_tools"] = True
-                    config["max_debate_rounds"] = 1  # Reducir rounds para análisis múltiple
-                    config["language"] = "spanish"
-                    config["language_instruction"] = "IMPORTANTE: Responde SIEMPRE en español. Todos los análisis, reportes y decisiones deben estar en español."
+                    ta = TradingAgentsGraph(debug=False, config=config, selected_analysts=list(analysts))
+                    runs = ta.propagate_many(
+                        [(ticker, formatted_date) for ticker in tickers],
+                        return_exceptions=True,
+                        force_refresh=force_refresh,
+                    )
+                    for ticker, _, result in runs:
+                        if isinstance(result, Exception):
+                            results[ticker] = {
+                                "asset_type": asset_types[ticker],
+                                "error": str(result),
+                                "status": "error"
+                            }
+                        else:
+                            state, decision = result
+                            results[ticker] = {
+                                "asset_type": asset_types[ticker],
+                                "state": state,
+                                "decision": decision,
+                                "status": "success"
+                            }
+                        completed += 1
+                        status_text.text(f"{ticker} ({asset_types[ticker]}) completado... {completed}/{len(selected_tickers)}")
+                        progress_bar.progress(completed / len(selected_tickers))
 
-                    # Seleccionar analistas según tipo de activo
-                    selected_analysts = get_analysts_for_asset(asset_type)
-                    ta = TradingAgentsGraph(debug=False, config=config, selected_analysts=selected_analysts)
-                    formatted_date = analysis_date.strftime("%Y-%m-%d")
-                    
-                    state, decision = ta.propagate(ticker, formatted_date)
-                    results[ticker] = {
-                        "asset_type": asset_type,
-                        "state": state,
-                        "decision": decision,
-                        "status": "success"
-                    }
-                    
                 except Exception as e:
-                    results[ticker] = {
-                        "asset_type": asset_type,
-                        "error": str(e),
-                        "status": "error"
-                    }
-                
-                progress_bar.progress((i + 1) / len(selected_tickers))
+                    for ticker in tickers:
+                        if ticker not in results:
+                            results[ticker] = {
+                                "asset_type": asset_types[ticker],
+                                "error": str(e),
+                                "status": "error"
+                            }
+                            completed += 1
+                    progress_bar.progress(completed / len(selected_tickers))
             
+            results = {ticker: results[ticker] for ticker in selected_tickers}
             status_text.text("¡Análisis múltiple completado!")
             
             # Mostrar resumen de resultados
@@ -0,0 +1,118 @@
+"""Benchmark the Finnhub insider transaction report on a synthetic file.
+
+Writes a finnhub_data/insider_trans file with the requested number of
+transactions (plus duplicates) into a temporary data dir, then times the
+previous list-based de-duplication against get_finnhub_company_insider_transactions
+and checks that both produce the same report. Run it from the repository
+root with the package installed (pip install -e .):
+
+    python benchmarks/insider_dedup.py --transactions 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+import tradingagents.dataflows.interface as interface
+from tradingagents.dataflows.finnhub_utils import get_data_in_range
+
+TICKER = "SYNTH"
+CURR_DATE = "2024-12-31"
+LOOK_BACK_DAYS = 365
+
+
+def write_synthetic_file(data_dir, transactions, duplicates, seed=0):
+    """Write {date: [transaction, ...]} with transactions spread over the look-back window."""
+    rng = random.Random(seed)
+    end = datetime.strptime(CURR_DATE, "%Y-%m-%d")
+    entries = []
+    for i in range(transactions):
+        filing_date = (end - timedelta(days=rng.randrange(LOOK_BACK_DAYS))).strftime("%Y-%m-%d")
+        entries.append(
+            {
+                "name": f"Insider {rng.randrange(500)}",
+                "share": rng.randrange(1, 1_000_000),
+                "change": rng.randrange(-50_000, 50_000),
+                "filingDate": filing_date,
+                "transactionDate": filing_date,
+                "transactionCode": rng.choice("SPMAG"),
+                "transactionPrice": round(rng.uniform(5, 500), 2),
+                "id": f"synthetic-{i}",
+            }
+        )
+    # the same filing listed under more than one date, as in real exports
+    entries.extend(rng.choice(entries) for _ in range(duplicates))
+
+    data = {}
+    for entry in entries:
+        data.setdefault(entry["filingDate"], []).append(entry)
+
+    path = os.path.join(data_dir, "finnhub_data", "insider_trans", f"{TICKER}_data_formatted.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(data.items())), f)
+
+
+def legacy_insider_transactions(ticker, curr_date, look_back_days, data_dir):
+    """The report as it was built before _unique_entries, for comparison."""
+    before = datetime.strptime(curr_date, "%Y-%m-%d") - relativedelta(days=look_back_days)
+    before = before.strftime("%Y-%m-%d")
+    data = get_data_in_range(ticker, before, curr_date, "insider_trans", data_dir)
+    if len(data) == 0:
+        return ""
+
+    result_str = ""
+    seen_dicts = []
+    for date, senti_list in data.items():
+        for entry in senti_list:
+            if entry not in seen_dicts:
+                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+                seen_dicts.append(entry)
+    return f"## {ticker} insider transactions from {before} to {curr_date}:\n" + result_str
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--duplicates", type=int, default=10000)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the current implementation")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_synthetic_file(data_dir, args.transactions, args.duplicates)
+        interface.DATA_DIR = data_dir
+
+        # load once so both timings measure the formatting, not the first json parse
+        get_data_in_range(TICKER, "1900-01-01", CURR_DATE, "insider_trans", data_dir)
+
+        report, current_seconds = timed(
+            interface.get_finnhub_company_insider_transactions, TICKER, CURR_DATE, LOOK_BACK_DAYS
+        )
+        print(f"{args.transactions} transactions + {args.duplicates} duplicates")
+        print(f"current: {current_seconds:.2f}s")
+
+        if not args.skip_legacy:
+            legacy_report, legacy_seconds = timed(
+                legacy_insider_transactions, TICKER, CURR_DATE, LOOK_BACK_DAYS, data_dir
+            )
+            print(f"legacy:  {legacy_seconds:.2f}s ({legacy_seconds / current_seconds:.0f}x)")
+            # the current report only adds the field glossary after the entries
+            assert report.startswith(legacy_report), "reports differ"
+            assert "### " not in report[len(legacy_report):], "reports differ"
+            print("reports are identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from typing import Optional
 import datetime
+import os
 import typer
 from pathlib import Path
 from functools import wraps
@@ -21,7 +22,15 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.backtest import Backtester, business_days
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.columnar import convert_data_dir
+from tradingagents.dataflows.reddit_utils import build_reddit_index
+from tradingagents.agents.utils.embeddings import NullEmbedder
+from tradingagents.agents.utils.memory import (
+    FinancialSituationMemory,
+    SITUATION_MEMORY_NAMES,
+)
 from cli.models import AnalystType
 from cli.utils import *
 
@@ -731,7 +740,7 @@ def extract_content_string(content):
     else:
         return str(content)
 
-def run_analysis():
+def run_analysis(force_refresh=False):
     # First get all user selections
     selections = get_user_selections()
 
@@ -841,9 +850,20 @@ def run_analysis():
         )
         args = graph.propagator.get_graph_args()
 
+        # Reuse an identical earlier run unless a fresh one was asked for
+        result_key = graph.result_key(selections["ticker"], selections["analysis_date"])
+        cached = None if force_refresh else graph.get_cached_run(result_key)
+        if cached is not None:
+            message_buffer.add_message(
+                "System", "Loaded the cached analysis, use --force-refresh to run it again"
+            )
+            chunks = []
+        else:
+            chunks = graph.graph.stream(init_agent_state, **args)
+
         # Stream the analysis
         trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
+        for chunk in chunks:
             if len(chunk["messages"]) > 0:
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
@@ -1074,8 +1094,12 @@ def run_analysis():
             trace.append(chunk)
 
         # Get final state and decision
-        final_state = trace[-1]
-        decision = graph.process_signal(final_state["final_trade_decision"])
+        if cached is not None:
+            final_state, decision = cached
+        else:
+            final_state = trace[-1]
+            decision = graph.process_signal(final_state["final_trade_decision"])
+            graph.cache_run(result_key, final_state, decision)
 
         # Update all agent statuses to completed
         for agent in message_buffer.agent_status:
@@ -1097,8 +1121,116 @@ def run_analysis():
 
 
 @app.command()
-def analyze():
-    run_analysis()
+def analyze(
+    force_refresh: bool = typer.Option(
+        False, help="Run the analysis again even if an identical run is cached"
+    ),
+):
+    run_analysis(force_refresh)
+
+
+@app.command()
+def convert_data(
+    data_dir: str = typer.Option(
+        DEFAULT_CONFIG["data_dir"], help="Root directory of the offline datasets"
+    ),
+):
+    """Convert the offline YFin price and SimFin csv files to Parquet."""
+    converted = convert_data_dir(data_dir)
+    if not converted:
+        console.print(f"[yellow]No price or SimFin csv files found under {data_dir}[/yellow]")
+        return
+    for path in converted:
+        console.print(f"[green]Converted[/green] {path}")
+
+
+@app.command()
+def index_reddit(
+    data_dir: str = typer.Option(
+        DEFAULT_CONFIG["data_dir"], help="Root directory of the offline datasets"
+    ),
+):
+    """Build the date index of the offline Reddit .jsonl files."""
+    indexed = build_reddit_index(os.path.join(data_dir, "reddit_data"))
+    console.print(f"[green]Indexed {len(indexed)} subreddit files[/green]")
+
+
+@app.command()
+def compact_memories(
+    memory_dir: str = typer.Option(
+        DEFAULT_CONFIG["memory_persist_dir"],
+        help="Directory of the persistent memories",
+    ),
+    max_entries: Optional[int] = typer.Option(
+        DEFAULT_CONFIG["memory_max_entries"],
+        help="Keep at most this many entries per memory",
+    ),
+    backend: str = typer.Option(
+        DEFAULT_CONFIG["memory_backend"],
+        help="Memory backend the directory was written by: chroma or numpy",
+    ),
+    collection_version: int = typer.Option(
+        DEFAULT_CONFIG["memory_collection_version"],
+        help="Collection version to compact",
+    ),
+):
+    """Merge duplicate situations in the persistent memories and apply the size limit."""
+    if not memory_dir:
+        console.print("[red]Set --memory-dir or TRADINGAGENTS_MEMORY_DIR to the memory directory[/red]")
+        raise typer.Exit(1)
+
+    config = DEFAULT_CONFIG.copy()
+    config["memory_persist_dir"] = memory_dir
+    config["memory_max_entries"] = max_entries
+    config["memory_backend"] = backend
+    config["memory_collection_version"] = collection_version
+    for name in SITUATION_MEMORY_NAMES:
+        # compaction reuses the stored embeddings, no embedding client is needed
+        memory = FinancialSituationMemory(name, config, embedder=NullEmbedder())
+        counts = memory.compact()
+        console.print(
+            f"[green]{name}[/green]: {counts['before']} -> {counts['after']} entries"
+        )
+
+
+@app.command()
+def backtest(
+    tickers: str = typer.Option(..., help="Comma-separated ticker symbols"),
+    start_date: str = typer.Option(..., help="First trade date, yyyy-mm-dd"),
+    end_date: str = typer.Option(..., help="Last trade date, yyyy-mm-dd"),
+    checkpoint: str = typer.Option(
+        os.path.join(DEFAULT_CONFIG["results_dir"], "backtest.jsonl"),
+        help="JSON Lines checkpoint, an existing one is resumed",
+    ),
+    max_concurrency: int = typer.Option(4, help="Steps run at the same time"),
+    reflect: bool = typer.Option(
+        False, help="Reflect on each step with its realized return"
+    ),
+    holding_days: int = typer.Option(1, help="Trading days each position is held"),
+):
+    """Run the agents over every trading day of a date range, resuming from a checkpoint."""
+    symbols = [ticker.strip().upper() for ticker in tickers.split(",") if ticker.strip()]
+    graph = TradingAgentsGraph(config=DEFAULT_CONFIG.copy())
+    backtester = Backtester(
+        graph,
+        checkpoint,
+        max_concurrency=max_concurrency,
+        reflect=reflect,
+        holding_days=holding_days,
+    )
+    for step in backtester.run(symbols, business_days(start_date, end_date)):
+        if "error" in step:
+            console.print(
+                f"[red]{step['ticker']} {step['trade_date']} failed:[/red] {step['error']}"
+            )
+        elif "skipped" in step:
+            console.print(
+                f"[yellow]{step['ticker']} {step['trade_date']} skipped:[/yellow] {step['skipped']}"
+            )
+        else:
+            console.print(
+                f"[green]{step['ticker']} {step['trade_date']}[/green] {step['decision']}"
+            )
 
 
 if __name__ == "__main__":
@@ -21,6 +21,7 @@ setup(
         "pandas>=2.0.0",
         "praw>=7.7.0",
         "stockstats>=0.5.4",
+        "tenacity>=8.2.0",
         "yfinance>=0.2.31",
         "typer>=0.9.0",
         "rich>=13.0.0",
@@ -1,6 +1,6 @@
 from .utils.agent_utils import Toolkit, create_msg_delete
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
-from .utils.memory import FinancialSituationMemory
+from .utils.memory import EmbeddingCache, FinancialSituationMemory
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
@@ -20,6 +20,7 @@ from .managers.risk_manager import create_risk_manager
 from .trader.trader import create_trader
 
 __all__ = [
+    "EmbeddingCache",
     "FinancialSituationMemory",
     "Toolkit",
     "AgentState",
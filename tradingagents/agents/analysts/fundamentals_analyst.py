@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_fundamentals_analyst(llm, toolkit):
@@ -69,7 +70,7 @@ def create_fundamentals_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -81,4 +82,4 @@ def create_fundamentals_analyst(llm, toolkit):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    return create_node(fundamentals_analyst_node)
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_market_analyst(llm, toolkit):
@@ -76,7 +77,7 @@ Indicadores Basados en Volumen:
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -88,4 +89,4 @@ Indicadores Basados en Volumen:
             "market_report": report,
         }
 
-    return market_analyst_node
+    return create_node(market_analyst_node)
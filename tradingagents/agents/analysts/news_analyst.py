@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_news_analyst(llm, toolkit):
@@ -45,7 +46,7 @@ def create_news_analyst(llm, toolkit):
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -57,4 +58,4 @@ def create_news_analyst(llm, toolkit):
             "news_report": report,
         }
 
-    return news_analyst_node
+    return create_node(news_analyst_node)
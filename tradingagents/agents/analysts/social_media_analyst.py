@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_social_media_analyst(llm, toolkit):
@@ -45,7 +46,7 @@ def create_social_media_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -57,4 +58,4 @@ def create_social_media_analyst(llm, toolkit):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    return create_node(social_media_analyst_node)
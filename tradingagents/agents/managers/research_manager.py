@@ -1,5 +1,7 @@
 import time
 import json
+import functools
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_research_manager(llm, memory):
@@ -13,7 +15,7 @@ def create_research_manager(llm, memory):
         investment_debate_state = state["investment_debate_state"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield functools.partial(memory.get_memories, n_matches=2), curr_situation
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -38,7 +40,7 @@ Aquí están tus reflexiones pasadas sobre errores:
 Aquí está el debate:
 Historia del Debate:
 {history}"""
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -54,4 +56,4 @@ Historia del Debate:
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return create_node(research_manager_node)
@@ -1,5 +1,7 @@
 import time
 import json
+import functools
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_risk_manager(llm, memory):
@@ -11,12 +13,12 @@ def create_risk_manager(llm, memory):
         risk_debate_state = state["risk_debate_state"]
         market_research_report = state["market_report"]
         news_report = state["news_report"]
-        fundamentals_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
         sentiment_report = state["sentiment_report"]
         trader_plan = state["investment_plan"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield functools.partial(memory.get_memories, n_matches=2), curr_situation
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -45,7 +47,7 @@ Entregables:
 
 Enfócate en perspectivas accionables y mejora continua. Construye sobre lecciones pasadas, evalúa críticamente todas las perspectivas, y asegura que cada decisión avance mejores resultados."""
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -65,4 +67,4 @@ Enfócate en perspectivas accionables y mejora continua. Construye sobre leccion
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    return create_node(risk_manager_node)
@@ -1,6 +1,8 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+import functools
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_bear_researcher(llm, memory):
@@ -16,7 +18,7 @@ def create_bear_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield functools.partial(memory.get_memories, n_matches=2), curr_situation
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -46,7 +48,7 @@ Reflexiones de situaciones similares y lecciones aprendidas: {past_memory_str}
 Usa esta información para entregar un argumento pesimista convincente, refutar las afirmaciones del optimista, y participar en un debate dinámico que demuestre los riesgos y debilidades de invertir en la acción. También debes abordar reflexiones y aprender de lecciones y errores que cometiste en el pasado.
 """
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Analista Pesimista: {response.content}"
 
@@ -60,4 +62,4 @@ Usa esta información para entregar un argumento pesimista convincente, refutar
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    return create_node(bear_node)
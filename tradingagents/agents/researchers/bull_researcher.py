@@ -1,6 +1,8 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+import functools
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_bull_researcher(llm, memory):
@@ -16,7 +18,7 @@ def create_bull_researcher(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield functools.partial(memory.get_memories, n_matches=2), curr_situation
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -44,7 +46,7 @@ Reflexiones de situaciones similares y lecciones aprendidas: {past_memory_str}
 Usa esta información para entregar un argumento optimista convincente, refutar las preocupaciones del pesimista, y participar en un debate dinámico que demuestre las fortalezas de la posición optimista. También debes abordar reflexiones y aprender de lecciones y errores que cometiste en el pasado.
 """
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Analista Optimista: {response.content}"
 
@@ -58,4 +60,4 @@ Usa esta información para entregar un argumento optimista convincente, refutar
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    return create_node(bull_node)
@@ -1,5 +1,6 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_risky_debator(llm):
@@ -34,7 +35,7 @@ Aquí está el historial actual de conversación: {history} Aquí están los úl
 
 Comprómetete activamente abordando cualquier preocupación específica planteada, refutando las debilidades en su lógica, y afirmando los beneficios de tomar riesgos para superar las normas del mercado. Mantén un enfoque en debatir y persuadir, no solo presentar datos. Desafía cada contrapunto para subrayar por qué un enfoque de alto riesgo es óptimo. Responde conversacionalmente como si estuvieras hablando sin ningún formato especial."""
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Analista Agresivo: {response.content}"
 
@@ -54,4 +55,4 @@ Comprómetete activamente abordando cualquier preocupación específica plantead
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    return create_node(risky_node)
@@ -1,6 +1,7 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_safe_debator(llm):
@@ -35,7 +36,7 @@ Aquí está el historial actual de conversación: {history} Aquí está la últi
 
 Comprómetete cuestionando su optimismo y enfatizando las posibles desventajas que pueden haber pasado por alto. Aborda cada uno de sus contrapuntos para mostrar por qué una postura conservadora es en última instancia el camino más seguro para los activos de la firma. Enfócate en debatir y criticar sus argumentos para demostrar la fortaleza de una estrategia de bajo riesgo sobre sus enfoques. Responde conversacionalmente como si estuvieras hablando sin ningún formato especial."""
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Analista Conservador: {response.content}"
 
@@ -57,4 +58,4 @@ Comprómetete cuestionando su optimismo y enfatizando las posibles desventajas q
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    return create_node(safe_node)
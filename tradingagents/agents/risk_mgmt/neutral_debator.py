@@ -1,5 +1,6 @@
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_neutral_debator(llm):
@@ -34,7 +35,7 @@ Aquí está el historial actual de conversación: {history} Aquí está la últi
 
 Comprómetete activamente analizando ambos lados críticamente, abordando debilidades en los argumentos agresivo y conservador para abogar por un enfoque más equilibrado. Desafía cada uno de sus puntos para ilustrar por qué una estrategia de riesgo moderado podría ofrecer lo mejor de ambos mundos, proporcionando potencial de crecimiento mientras protege contra volatilidad extrema. Enfócate en debatir en lugar de simplemente presentar datos, apuntando a mostrar que una vista equilibrada puede llevar a los resultados más confiables. Responde conversacionalmente como si estuvieras hablando sin ningún formato especial."""
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Analista Neutral: {response.content}"
 
@@ -54,4 +55,4 @@ Comprómetete activamente analizando ambos lados críticamente, abordando debili
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return neutral_node
+    return create_node(neutral_node)
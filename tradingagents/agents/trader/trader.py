@@ -1,6 +1,7 @@
 import functools
 import time
 import json
+from tradingagents.agents.utils.agent_utils import create_node
 
 
 def create_trader(llm, memory):
@@ -13,7 +14,7 @@ def create_trader(llm, memory):
         fundamentals_report = state["fundamentals_report"]
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        past_memories = yield functools.partial(memory.get_memories, n_matches=2), curr_situation
 
         past_memory_str = ""
         if past_memories:
@@ -35,7 +36,7 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        result = yield llm, messages
 
         return {
             "messages": [result],
@@ -43,4 +44,4 @@ def create_trader(llm, memory):
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return create_node(functools.partial(trader_node, name="Trader"))
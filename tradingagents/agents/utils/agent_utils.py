@@ -3,14 +3,17 @@ from typing import List
 from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_core.tools import tool
 from datetime import date, timedelta, datetime
+import asyncio
 import functools
 import pandas as pd
 import os
 from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
+from tradingagents.agents.utils.tool_cache import memoize_tool, tool_cache_stats
 from tradingagents.default_config import DEFAULT_CONFIG
 from langchain_core.messages import HumanMessage
 
@@ -31,6 +34,46 @@ def create_msg_delete():
     return delete_messages
 
 
+def create_node(node_steps):
+    """Build a graph node that runs under both graph.invoke and graph.ainvoke.
+
+    node_steps(state) is a generator that yields (target, input) pairs for its
+    LLM calls and other blocking work, receives each result back, and returns
+    the state update. Runnables are called with invoke, or awaited with ainvoke
+    on the async path; plain callables run inline, or in the default executor
+    on the async path, so one event loop can drive many analyses.
+    """
+
+    def node(state):
+        steps = node_steps(state)
+        try:
+            target, value = next(steps)
+            while True:
+                if hasattr(target, "invoke"):
+                    result = target.invoke(value)
+                else:
+                    result = target(value)
+                target, value = steps.send(result)
+        except StopIteration as done:
+            return done.value
+
+    async def anode(state):
+        steps = node_steps(state)
+        try:
+            target, value = next(steps)
+            while True:
+                if hasattr(target, "ainvoke"):
+                    result = await target.ainvoke(value)
+                else:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(None, target, value)
+                target, value = steps.send(result)
+        except StopIteration as done:
+            return done.value
+
+    return RunnableLambda(node, afunc=anode)
+
+
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -48,8 +91,14 @@ class Toolkit:
         if config:
             self.update_config(config)
 
+    @staticmethod
+    def cache_stats():
+        """Per-tool hit rates of the memoized tool results."""
+        return tool_cache_stats()
+
     @staticmethod
     @tool
+    @memoize_tool
     def get_reddit_news(
         curr_date: Annotated[str, "Date you want to get news for in yyyy-mm-dd format"],
     ) -> str:
@@ -67,6 +116,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_finnhub_news(
         ticker: Annotated[
             str,
@@ -99,6 +149,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_reddit_stock_info(
         ticker: Annotated[
             str,
@@ -121,6 +172,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_YFin_data(
         symbol: Annotated[str, "ticker symbol of the company"],
         start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -142,6 +194,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_YFin_data_online(
         symbol: Annotated[str, "ticker symbol of the company"],
         start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -163,6 +216,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_stockstats_indicators_report(
         symbol: Annotated[str, "ticker symbol of the company"],
         indicator: Annotated[
@@ -192,6 +246,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_stockstats_indicators_report_online(
         symbol: Annotated[str, "ticker symbol of the company"],
         indicator: Annotated[
@@ -221,6 +276,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_finnhub_company_insider_sentiment(
         ticker: Annotated[str, "ticker symbol for the company"],
         curr_date: Annotated[
@@ -245,6 +301,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_finnhub_company_insider_transactions(
         ticker: Annotated[str, "ticker symbol"],
         curr_date: Annotated[
@@ -269,6 +326,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_simfin_balance_sheet(
         ticker: Annotated[str, "ticker symbol"],
         freq: Annotated[
@@ -293,6 +351,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_simfin_cashflow(
         ticker: Annotated[str, "ticker symbol"],
         freq: Annotated[
@@ -317,6 +376,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_simfin_income_stmt(
         ticker: Annotated[str, "ticker symbol"],
         freq: Annotated[
@@ -343,6 +403,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_google_news(
         query: Annotated[str, "Query to search with"],
         curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -363,6 +424,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_stock_news_openai(
         ticker: Annotated[str, "the company's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -382,6 +444,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_global_news_openai(
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
     ):
@@ -399,6 +462,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @memoize_tool
     def get_fundamentals_openai(
         ticker: Annotated[str, "the company's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -0,0 +1,246 @@
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+
+import numpy as np
+import openai
+from openai import OpenAI
+from tenacity import (
+    Retrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+# errors worth retrying, anything else (bad request, auth) fails immediately
+TRANSIENT_EMBEDDING_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+OLLAMA_BACKEND_URL = "http://localhost:11434/v1"
+DEFAULT_LOCAL_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class OpenAIEmbedder:
+    """Embeds batches of texts through an OpenAI-compatible embeddings endpoint."""
+
+    def __init__(self, backend_url, model=None, max_retries=5):
+        if model is None:
+            model = "nomic-embed-text" if backend_url == OLLAMA_BACKEND_URL else "text-embedding-3-small"
+        self.model = model
+        self.client = OpenAI(base_url=backend_url)
+        self.max_retries = max_retries
+
+    def __call__(self, texts):
+        """Embed one batch of texts in a single request, retrying transient errors with backoff"""
+        retrying = Retrying(
+            retry=retry_if_exception_type(TRANSIENT_EMBEDDING_ERRORS),
+            wait=wait_exponential(multiplier=1, min=1, max=30),
+            stop=stop_after_attempt(self.max_retries),
+            reraise=True,
+        )
+        response = retrying(self.client.embeddings.create, model=self.model, input=texts)
+        # the API may return the items out of order, each one carries its input index
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+@lru_cache(maxsize=None)
+def _load_sentence_transformer(model, device):
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as e:
+        raise ImportError(
+            "The local embedding provider needs sentence-transformers: pip install sentence-transformers"
+        ) from e
+    return SentenceTransformer(model, device=device)
+
+
+class LocalEmbedder:
+    """In-process sentence-transformers embedder, CPU by default.
+
+    The model is loaded once per process and shared by every embedder using it.
+    Batches are encoded one at a time since the model already uses every core.
+    """
+
+    def __init__(self, model=None, device="cpu", batch_size=64):
+        self.model = model or DEFAULT_LOCAL_EMBEDDING_MODEL
+        self.device = device
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        encoder = _load_sentence_transformer(self.model, self.device)
+        with self._lock:
+            vectors = encoder.encode(
+                list(texts),
+                batch_size=self.batch_size,
+                normalize_embeddings=True,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+        return vectors.tolist()
+
+
+class HashingEmbedder:
+    """Deterministic local embedder that hashes word tokens into a fixed-size vector.
+
+    It needs no network or model download, so it stands in for the embedding API
+    in tests and offline runs. Texts sharing more words get closer vectors.
+    """
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def __call__(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text):
+        vector = [0.0] * self.dim
+        for token in re.findall(r"\w+", text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+class NullEmbedder:
+    """Stand-in for maintenance that reads and rewrites stored entries without embedding.
+
+    Its model is None, so a memory opened with it accepts whatever embedding
+    model the collection was built with.
+    """
+
+    model = None
+
+    def __call__(self, texts):
+        raise RuntimeError("NullEmbedder cannot embed, open the memory with a real embedder")
+
+
+class DiskEmbeddingCache:
+    """SQLite table of float32 embeddings keyed by (model, sha256 of the text).
+
+    Shared between processes through the file, so restarts and repeated
+    backtests never pay twice for the same text.
+    """
+
+    def __init__(self, cache_dir):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "embeddings.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def text_hash(text):
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model, texts):
+        """Return {text: embedding} for the texts already cached for model"""
+        hashes = {self.text_hash(text): text for text in texts}
+        found = {}
+        keys = list(hashes)
+        with self._lock:
+            # stay well below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN "
+                    f"({','.join('?' * len(chunk))})",
+                    [model, *chunk],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[hashes[text_hash]] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, model, embeddings_by_text):
+        rows = [
+            (model, self.text_hash(text), np.asarray(embedding, dtype=np.float32).tobytes())
+            for text, embedding in embeddings_by_text.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+
+class CachedEmbedder:
+    """Wraps an embedder so each batch is served from a DiskEmbeddingCache where possible."""
+
+    def __init__(self, embedder, disk_cache):
+        self.embedder = embedder
+        self.disk_cache = disk_cache
+        self.model = embedder.model
+
+    def __call__(self, texts):
+        cached = self.disk_cache.get_many(self.model, texts)
+        missing = [text for text in dict.fromkeys(texts) if text not in cached]
+        if missing:
+            fresh = dict(zip(missing, self.embedder(missing)))
+            self.disk_cache.put_many(self.model, fresh)
+            # serve the stored float32 values so cold and warm runs see the same vectors
+            cached.update(self.disk_cache.get_many(self.model, missing))
+        return [cached[text] for text in texts]
+
+
+_disk_caches = {}
+_disk_caches_lock = threading.Lock()
+
+
+def get_disk_embedding_cache(cache_dir):
+    """Get the process-wide DiskEmbeddingCache for a directory"""
+    cache_dir = os.path.abspath(cache_dir)
+    with _disk_caches_lock:
+        if cache_dir not in _disk_caches:
+            _disk_caches[cache_dir] = DiskEmbeddingCache(cache_dir)
+        return _disk_caches[cache_dir]
+
+
+def create_embedder(config):
+    """Build the embedder selected by config["embedding_provider"].
+
+    "openai" calls the OpenAI-compatible API at backend_url, "local" runs a
+    sentence-transformers model in-process and "hashing" is the deterministic
+    stand-in. The first two go through the disk cache when embedding_cache_dir
+    is set.
+    """
+    provider = config.get("embedding_provider", "openai").lower()
+    model = config.get("embedding_model")
+
+    if provider == "openai":
+        embedder = OpenAIEmbedder(
+            config["backend_url"],
+            model=model,
+            max_retries=config.get("embedding_max_retries", 5),
+        )
+    elif provider == "local":
+        embedder = LocalEmbedder(
+            model=model,
+            device=config.get("embedding_device", "cpu"),
+            batch_size=config.get("embedding_batch_size", 128),
+        )
+    elif provider == "hashing":
+        return HashingEmbedder()
+    else:
+        raise ValueError(f"Unsupported embedding provider: {provider}")
+
+    cache_dir = config.get("embedding_cache_dir")
+    if cache_dir:
+        embedder = CachedEmbedder(embedder, get_disk_embedding_cache(cache_dir))
+    return embedder
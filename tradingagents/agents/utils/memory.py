@@ -1,78 +1,243 @@
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .embeddings import HashingEmbedder, create_embedder
+from .memory_backends import create_memory_backend
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of embeddings keyed by a hash of the model and text.
+
+    One instance is shared by all the memories of a graph, so the situation that
+    every researcher and manager queries with is only embedded once per run.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model, text):
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key, embedding):
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+SITUATION_MEMORY_NAMES = [
+    "bull_memory",
+    "bear_memory",
+    "trader_memory",
+    "invest_judge_memory",
+    "risk_manager_memory",
+]
 
 
 class FinancialSituationMemory:
-    def __init__(self, name, config):
-        if config["backend_url"] == "http://localhost:11434/v1":
-            self.embedding = "nomic-embed-text"
-        else:
-            self.embedding = "text-embedding-3-small"
-        self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        try:
-            self.situation_collection = self.chroma_client.create_collection(name=name)
-        except Exception:
-            # Si la colección ya existe, la obtenemos en lugar de crearla
-            self.situation_collection = self.chroma_client.get_collection(name=name)
-    
+    def __init__(self, name, config, embedding_cache=None, embedder=None):
+        self.embedder = embedder or create_embedder(config)
+        self.embedding = self.embedder.model
+        self.batch_size = config.get("embedding_batch_size", 128)
+        self.max_workers = config.get("embedding_max_workers", 4)
+        self.embedding_cache = embedding_cache
+
+        # persisted collections are versioned so a change in what gets stored can
+        # start from a fresh collection instead of mixing with the old entries
+        version = config.get("memory_collection_version")
+        self.collection_name = f"{name}_v{version}" if version is not None else name
+        self.backend = create_memory_backend(self.collection_name, self.embedding, config)
+
+        # optional size limit, evicting the least recently retrieved ("lru") or oldest ("age") entries
+        self.max_entries = config.get("memory_max_entries")
+        self.eviction = config.get("memory_eviction", "lru")
+        if self.eviction not in ("lru", "age"):
+            raise ValueError(f"Unsupported memory eviction policy: {self.eviction}")
+
     def reset_collection(self):
         """Resetea la colección de memoria si es necesario"""
         try:
-            self.chroma_client.delete_collection(name=self.situation_collection.name)
-            self.situation_collection = self.chroma_client.create_collection(name=self.situation_collection.name)
+            self.backend.reset()
         except Exception:
             pass
 
+    def get_embeddings(self, texts):
+        """Get embeddings for many texts, sending the uncached ones in concurrent batches"""
+        embeddings = [None] * len(texts)
+        pending = {}
+        for i, text in enumerate(texts):
+            cached = None
+            if self.embedding_cache is not None:
+                cached = self.embedding_cache.get(self.embedding_cache.key(self.embedding, text))
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                # identical texts are embedded once
+                pending.setdefault(text, []).append(i)
+
+        unique_texts = list(pending)
+        batches = [
+            unique_texts[start : start + self.batch_size]
+            for start in range(0, len(unique_texts), self.batch_size)
+        ]
+        if len(batches) > 1 and self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                batch_results = list(executor.map(self.embedder, batches))
+        else:
+            batch_results = [self.embedder(batch) for batch in batches]
+
+        for batch, results in zip(batches, batch_results):
+            for text, embedding in zip(batch, results):
+                if self.embedding_cache is not None:
+                    self.embedding_cache.put(self.embedding_cache.key(self.embedding, text), embedding)
+                for i in pending[text]:
+                    embeddings[i] = embedding
+
+        return embeddings
+
     def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
-        )
-        return response.data[0].embedding
+        """Get the embedding for a text"""
+        return self.get_embeddings([text])[0]
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    @staticmethod
+    def situation_id(situation):
+        """Content-addressed id, storing the same situation again replaces its advice"""
+        return hashlib.sha256(situation.encode("utf-8")).hexdigest()
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+    def add_situations(self, situations_and_advice, embeddings=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)
 
-        offset = self.situation_collection.count()
+        embeddings, when given, are the already computed situation embeddings in the same order.
+        """
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        # repeated situations keep the last advice given for them
+        advice_by_situation = {}
+        for situation, recommendation in situations_and_advice:
+            advice_by_situation.pop(situation, None)
+            advice_by_situation[situation] = recommendation
+        if not advice_by_situation:
+            return
 
-        self.situation_collection.add(
+        situations = list(advice_by_situation)
+        if embeddings is None:
+            embeddings = self.get_embeddings(situations)
+        else:
+            embedding_by_situation = {
+                situation: embedding
+                for (situation, _), embedding in zip(situations_and_advice, embeddings)
+            }
+            embeddings = [embedding_by_situation[situation] for situation in situations]
+        now = time.time()
+
+        self.backend.upsert(
+            ids=[self.situation_id(situation) for situation in situations],
             documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
             embeddings=embeddings,
-            ids=ids,
+            metadatas=[
+                {"recommendation": rec, "added_at": now, "last_retrieved": now}
+                for rec in advice_by_situation.values()
+            ],
         )
+        self._evict()
+
+    def _evict(self):
+        if not self.max_entries or self.backend.count() <= self.max_entries:
+            return
+        field = "last_retrieved" if self.eviction == "lru" else "added_at"
+        entries = self.backend.get_all(include_embeddings=False)
+        # entries stored before timestamps were recorded sort first
+        entries.sort(key=lambda entry: (entry[2] or {}).get(field, 0.0))
+        excess = len(entries) - self.max_entries
+        self.backend.delete([entry[0] for entry in entries[:excess]])
+
+    def compact(self):
+        """Merge duplicate situations under their content id and apply the size limit.
+
+        Collections written before ids were content-addressed hold one entry per
+        add, this keeps only the most recent advice for each situation.
+        Returns the entry counts before and after.
+        """
+        before = self.backend.count()
+        entries = self.backend.get_all()
+
+        def recency(item):
+            position, (entry_id, _, metadata, _) = item
+            metadata = metadata or {}
+            legacy_order = int(entry_id) if entry_id.isdigit() else -1
+            return (metadata.get("added_at", 0.0), legacy_order, position)
+
+        latest = {}
+        for position, entry in sorted(enumerate(entries), key=recency):
+            latest[entry[1]] = entry
+
+        kept = {}
+        for situation, (_, _, metadata, embedding) in latest.items():
+            metadata = dict(metadata or {})
+            metadata.setdefault("added_at", 0.0)
+            metadata.setdefault("last_retrieved", metadata["added_at"])
+            kept[self.situation_id(situation)] = (situation, embedding, metadata)
+
+        # write the merged entries before dropping the others so nothing is lost midway
+        if kept:
+            self.backend.upsert(
+                ids=list(kept),
+                documents=[entry[0] for entry in kept.values()],
+                embeddings=[entry[1] for entry in kept.values()],
+                metadatas=[entry[2] for entry in kept.values()],
+            )
+        self.backend.delete([entry[0] for entry in entries if entry[0] not in kept])
+        self._evict()
+        return {"before": before, "after": self.backend.count()}
+
+    def fingerprint(self):
+        """Entry count and latest write time, changing whenever a lesson is added or replaced"""
+        entries = self.backend.get_all(include_embeddings=False)
+        last_added = max(((metadata or {}).get("added_at", 0.0) for _, _, metadata, _ in entries), default=0.0)
+        return f"{len(entries)}:{last_added}"
 
     def get_memories(self, current_situation, n_matches=1):
         """Find matching recommendations using OpenAI embeddings"""
         query_embedding = self.get_embedding(current_situation)
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
-        )
+        results = self.backend.query(query_embedding, n_matches)
+
+        if results and self.max_entries and self.eviction == "lru":
+            now = time.time()
+            self.backend.update_metadatas(
+                [entry_id for entry_id, _, _, _ in results],
+                [dict(metadata, last_retrieved=now) for _, _, metadata, _ in results],
+            )
 
         matched_results = []
-        for i in range(len(results["documents"][0])):
+        for _, document, metadata, distance in results:
             matched_results.append(
                 {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
+                    "matched_situation": document,
+                    "recommendation": metadata["recommendation"],
+                    "similarity_score": 1 - distance,
                 }
             )
 
@@ -0,0 +1,368 @@
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+
+import numpy as np
+
+
+class MemoryBackend:
+    """Storage and nearest-neighbour search behind a FinancialSituationMemory.
+
+    Distances follow chromadb's default squared L2 metric so that
+    FinancialSituationMemory reports the same similarity scores whatever
+    backend is configured.
+    """
+
+    def __init__(self, name, embedding_model):
+        self.name = name
+        self.embedding_model = embedding_model
+
+    def count(self):
+        raise NotImplementedError
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        """Insert entries, replacing the ones whose id is already stored"""
+        raise NotImplementedError
+
+    def query(self, embedding, n_results):
+        """Return the n_results closest entries as (id, document, metadata, distance) tuples"""
+        raise NotImplementedError
+
+    def get_all(self, include_embeddings=True):
+        """Return every entry as (id, document, metadata, embedding) tuples, embedding is None when not included"""
+        raise NotImplementedError
+
+    def update_metadatas(self, ids, metadatas):
+        raise NotImplementedError
+
+    def delete(self, ids):
+        raise NotImplementedError
+
+    def flush(self):
+        """Write out changes the backend holds back, if any"""
+
+    def reset(self):
+        raise NotImplementedError
+
+    def _check_embedding_model(self, stored_model):
+        # no configured model (maintenance without embedding) adopts the stored one
+        if self.embedding_model is None:
+            self.embedding_model = stored_model
+            return
+        if stored_model is not None and stored_model != self.embedding_model:
+            raise ValueError(
+                f"Memory collection '{self.name}' was built with embedding model "
+                f"'{stored_model}' but '{self.embedding_model}' is configured. Bump "
+                f"memory_collection_version to start a new collection."
+            )
+
+
+class ChromaBackend(MemoryBackend):
+    """Chroma collection, in-process or persisted under persist_dir."""
+
+    def __init__(self, name, embedding_model, persist_dir=None):
+        super().__init__(name, embedding_model)
+        # chromadb is slow to import, only pay for it when this backend is used
+        import chromadb
+        from chromadb.config import Settings
+
+        self.metadata = {"embedding_model": embedding_model} if embedding_model else None
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            self.client = chromadb.PersistentClient(
+                path=persist_dir, settings=Settings(allow_reset=True)
+            )
+        else:
+            self.client = chromadb.Client(Settings(allow_reset=True))
+
+        # reopening a persisted collection is a warm start, the stored embeddings are reused as is
+        self.collection = self.client.get_or_create_collection(
+            name=name, metadata=self.metadata
+        )
+        self._check_embedding_model((self.collection.metadata or {}).get("embedding_model"))
+        if self.embedding_model:
+            self.metadata = {"embedding_model": self.embedding_model}
+
+    def count(self):
+        return self.collection.count()
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        self.collection.upsert(
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings,
+            ids=ids,
+        )
+
+    def query(self, embedding, n_results):
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=n_results,
+            include=["metadatas", "documents", "distances"],
+        )
+        return list(
+            zip(
+                results["ids"][0],
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
+            )
+        )
+
+    def get_all(self, include_embeddings=True):
+        include = ["documents", "metadatas"] + (["embeddings"] if include_embeddings else [])
+        results = self.collection.get(include=include)
+        if include_embeddings:
+            embeddings = [list(embedding) for embedding in results["embeddings"]]
+        else:
+            embeddings = [None] * len(results["ids"])
+        return list(zip(results["ids"], results["documents"], results["metadatas"], embeddings))
+
+    def update_metadatas(self, ids, metadatas):
+        self.collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, ids):
+        if ids:
+            self.collection.delete(ids=ids)
+
+    def reset(self):
+        self.client.delete_collection(name=self.name)
+        self.collection = self.client.create_collection(name=self.name, metadata=self.metadata)
+
+
+class NumpyBackend(MemoryBackend):
+    """Normalized embeddings in one contiguous float32 matrix, searched by brute force.
+
+    A query is a single matrix-vector product followed by argpartition, which for
+    a few thousand entries per role is faster and lighter than a vector database.
+    With persist_dir the matrix is saved as {name}.npy next to a {name}.json file
+    holding ids, documents and metadata; mmap opens the matrix memory-mapped
+    instead of reading it into RAM. Every upsert or delete rewrites both files,
+    so the matrix never holds dead rows. Metadata-only updates (the retrieval
+    times of the lru eviction) stay in memory until the next write, at most
+    flush_interval seconds later, or process exit.
+    """
+
+    def __init__(self, name, embedding_model, persist_dir=None, mmap=False, flush_interval=60.0):
+        super().__init__(name, embedding_model)
+        self.persist_dir = persist_dir
+        self.mmap = mmap
+        self.flush_interval = flush_interval
+        self._records_dirty = False
+        self._records_saved_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._ids = []
+        self._positions = {}
+        self._documents = []
+        self._metadatas = []
+
+        if persist_dir:
+            os.makedirs(persist_dir, exist_ok=True)
+            if os.path.exists(self._records_path):
+                self._load()
+            atexit.register(_flush_backend, weakref.ref(self))
+
+    @property
+    def _matrix_path(self):
+        return os.path.join(self.persist_dir, f"{self.name}.npy")
+
+    @property
+    def _records_path(self):
+        return os.path.join(self.persist_dir, f"{self.name}.json")
+
+    def _load(self):
+        with open(self._records_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        self._check_embedding_model(records.get("embedding_model"))
+        self._ids = records["ids"]
+        self._documents = records["documents"]
+        self._metadatas = records["metadatas"]
+        self._positions = {entry_id: i for i, entry_id in enumerate(self._ids)}
+        if self._ids:
+            self._matrix = np.load(self._matrix_path, mmap_mode="r" if self.mmap else None)
+
+    def _save(self):
+        matrix = self._matrix
+        # release the memory map before its file is replaced
+        self._matrix = None
+
+        if matrix is None:
+            if os.path.exists(self._matrix_path):
+                os.remove(self._matrix_path)
+        else:
+            tmp_matrix = self._matrix_path + ".tmp.npy"
+            np.save(tmp_matrix, matrix)
+            os.replace(tmp_matrix, self._matrix_path)
+        self._save_records()
+
+        if matrix is not None and self.mmap:
+            matrix = np.load(self._matrix_path, mmap_mode="r")
+        self._matrix = matrix
+
+    def _save_records(self):
+        tmp_records = self._records_path + ".tmp"
+        with open(tmp_records, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "embedding_model": self.embedding_model,
+                    "ids": self._ids,
+                    "documents": self._documents,
+                    "metadatas": self._metadatas,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_records, self._records_path)
+        self._records_dirty = False
+        self._records_saved_at = time.monotonic()
+
+    @staticmethod
+    def _normalize(embeddings):
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def count(self):
+        return len(self._ids)
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        if not ids:
+            return
+        rows = self._normalize(embeddings)
+        # the last occurrence of a repeated id wins, like a sequence of single upserts
+        entries = {}
+        for entry_id, document, row, metadata in zip(ids, documents, rows, metadatas):
+            entries[entry_id] = (document, row, metadata)
+
+        with self._lock:
+            # a memory map is read-only, replacing rows needs an in-memory copy
+            matrix = np.array(self._matrix) if self._matrix is not None else None
+            new_rows = []
+            for entry_id, (document, row, metadata) in entries.items():
+                position = self._positions.get(entry_id)
+                if position is not None:
+                    matrix[position] = row
+                    self._documents[position] = document
+                    self._metadatas[position] = metadata
+                    continue
+                self._positions[entry_id] = len(self._ids)
+                self._ids.append(entry_id)
+                self._documents.append(document)
+                self._metadatas.append(metadata)
+                new_rows.append(row)
+
+            if new_rows:
+                new_rows = np.stack(new_rows)
+                matrix = new_rows if matrix is None else np.concatenate([matrix, new_rows])
+            self._matrix = np.ascontiguousarray(matrix)
+            if self.persist_dir:
+                self._save()
+
+    def query(self, embedding, n_results):
+        with self._lock:
+            matrix = self._matrix
+            size = len(self._ids)
+            if matrix is None or size == 0 or n_results <= 0:
+                return []
+            query = self._normalize(embedding)
+            scores = matrix @ query
+
+            k = min(n_results, size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            # squared L2 between unit vectors, the same scale as chromadb's default
+            return [
+                (
+                    self._ids[i],
+                    self._documents[i],
+                    self._metadatas[i],
+                    float(2.0 - 2.0 * scores[i]),
+                )
+                for i in top
+            ]
+
+    def get_all(self, include_embeddings=True):
+        with self._lock:
+            return [
+                (
+                    entry_id,
+                    document,
+                    metadata,
+                    self._matrix[i].tolist() if include_embeddings else None,
+                )
+                for i, (entry_id, document, metadata) in enumerate(
+                    zip(self._ids, self._documents, self._metadatas)
+                )
+            ]
+
+    def update_metadatas(self, ids, metadatas):
+        with self._lock:
+            for entry_id, metadata in zip(ids, metadatas):
+                position = self._positions.get(entry_id)
+                if position is not None:
+                    self._metadatas[position] = metadata
+            if self.persist_dir:
+                # rewriting every record per lookup would make retrieval O(N) in disk I/O
+                self._records_dirty = True
+                if time.monotonic() - self._records_saved_at >= self.flush_interval:
+                    self._save_records()
+
+    def flush(self):
+        with self._lock:
+            if self.persist_dir and self._records_dirty:
+                self._save_records()
+
+    def delete(self, ids):
+        with self._lock:
+            doomed = {self._positions[entry_id] for entry_id in ids if entry_id in self._positions}
+            if not doomed:
+                return
+            keep = [i for i in range(len(self._ids)) if i not in doomed]
+            self._matrix = np.ascontiguousarray(self._matrix[keep]) if keep else None
+            self._ids = [self._ids[i] for i in keep]
+            self._documents = [self._documents[i] for i in keep]
+            self._metadatas = [self._metadatas[i] for i in keep]
+            self._positions = {entry_id: i for i, entry_id in enumerate(self._ids)}
+            if self.persist_dir:
+                self._save()
+
+    def reset(self):
+        with self._lock:
+            self._matrix = None
+            self._ids = []
+            self._positions = {}
+            self._documents = []
+            self._metadatas = []
+            self._records_dirty = False
+            if self.persist_dir:
+                for path in (self._matrix_path, self._records_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+
+def _flush_backend(backend_ref):
+    backend = backend_ref()
+    if backend is not None:
+        backend.flush()
+
+
+def create_memory_backend(name, embedding_model, config):
+    """Build the memory backend selected by config["memory_backend"]"""
+    backend = config.get("memory_backend", "chroma").lower()
+    persist_dir = config.get("memory_persist_dir")
+    if backend == "chroma":
+        return ChromaBackend(name, embedding_model, persist_dir=persist_dir)
+    if backend == "numpy":
+        return NumpyBackend(
+            name,
+            embedding_model,
+            persist_dir=persist_dir,
+            mmap=config.get("memory_mmap", False),
+            flush_interval=config.get("memory_flush_interval", 60.0),
+        )
+    raise ValueError(f"Unsupported memory backend: {backend}")
@@ -0,0 +1,226 @@
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.utils import ErrorResult
+
+# Seconds a tool result stays valid. Offline tools read local files that rarely
+# change, online ones can see new prices or articles for the current day.
+DEFAULT_TOOL_TTLS = {
+    "get_reddit_news": 86400,
+    "get_finnhub_news": 86400,
+    "get_reddit_stock_info": 86400,
+    "get_YFin_data": 86400,
+    "get_stockstats_indicators_report": 86400,
+    "get_finnhub_company_insider_sentiment": 86400,
+    "get_finnhub_company_insider_transactions": 86400,
+    "get_simfin_balance_sheet": 86400,
+    "get_simfin_cashflow": 86400,
+    "get_simfin_income_stmt": 86400,
+    "get_YFin_data_online": 900,
+    "get_stockstats_indicators_report_online": 900,
+    "get_google_news": 1800,
+    "get_stock_news_openai": 3600,
+    "get_global_news_openai": 3600,
+    "get_fundamentals_openai": 3600,
+}
+DEFAULT_TOOL_TTL = 600
+
+# Config entries a tool result depends on besides its arguments
+TOOL_CONFIG_KEYS = ["data_dir", "backend_url", "quick_think_llm"]
+
+_IMMUTABLE_RESULTS = (str, bytes, int, float, bool, type(None))
+
+
+def _detached(value):
+    # callers may modify frames or dicts they get back, never share the cached object
+    if isinstance(value, _IMMUTABLE_RESULTS):
+        return value
+    return copy.deepcopy(value)
+
+
+class ToolCache:
+    """Memoized tool results in a bounded LRU memory tier and an optional SQLite tier.
+
+    Entries expire after their tool's TTL. The disk tier is shared between
+    processes through the file, so repeated runs on the same date reuse the
+    calls of earlier ones. Hits and misses are counted per tool.
+    """
+
+    def __init__(self, max_entries=512, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._conn = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.path = os.path.join(cache_dir, "tool_cache.sqlite")
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "key TEXT PRIMARY KEY, tool TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def _count(self, tool_name, outcome):
+        counts = self._stats.setdefault(tool_name, {"hits": 0, "disk_hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    def get(self, tool_name, key):
+        """Return (True, result) for a live entry, or (False, None)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._count(tool_name, "hits")
+                    return True, entry[1]
+                del self._entries[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM tool_cache WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._store(key, row[1], value)
+                    self._count(tool_name, "disk_hits")
+                    return True, value
+
+            self._count(tool_name, "misses")
+            return False, None
+
+    def put(self, tool_name, key, value, ttl):
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._store(key, expires_at, value)
+            if self._conn is None:
+                return
+            try:
+                serialized = json.dumps(value, ensure_ascii=False)
+            except (TypeError, ValueError):
+                # results that are not JSON stay in the memory tier only
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, tool, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, tool_name, serialized, expires_at),
+            )
+            self._conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def _store(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM tool_cache")
+                self._conn.commit()
+
+    def stats(self):
+        """Return {tool: {"hits", "disk_hits", "misses", "hit_rate"}}."""
+        with self._lock:
+            report = {}
+            for tool_name, counts in self._stats.items():
+                calls = counts["hits"] + counts["disk_hits"] + counts["misses"]
+                report[tool_name] = {
+                    **counts,
+                    "hit_rate": (counts["hits"] + counts["disk_hits"]) / calls if calls else 0.0,
+                }
+            return report
+
+
+_tool_cache = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_tool_cache():
+    """Get the shared tool cache, rebuilding it whenever its config settings change.
+
+    A rebuilt cache starts with an empty memory tier but keeps the per-tool counters.
+    """
+    global _tool_cache
+    config = get_config()
+    max_entries = config.get("tool_cache_max_entries", 512)
+    cache_dir = config.get("tool_cache_dir")
+    with _tool_cache_lock:
+        if (
+            _tool_cache is None
+            or _tool_cache.max_entries != max_entries
+            or _tool_cache.cache_dir != cache_dir
+        ):
+            previous = _tool_cache
+            _tool_cache = ToolCache(max_entries=max_entries, cache_dir=cache_dir)
+            if previous is not None:
+                _tool_cache._stats = previous._stats
+        return _tool_cache
+
+
+def tool_cache_stats():
+    """Per-tool hit rates of the shared tool cache."""
+    return get_tool_cache().stats()
+
+
+def memoize_tool(func):
+    """Memoize a tool function on its name, bound arguments and the config it reads.
+
+    Goes under @tool, which still sees the original signature and docstring.
+    The TTL comes from config["tool_cache_ttl"][name], then DEFAULT_TOOL_TTLS.
+    Set config["tool_cache_enabled"] to False to always call through. Results
+    marked as ErrorResult are returned but never cached, and mutable results
+    are copied so no caller shares the cached object.
+    """
+    signature = inspect.signature(func)
+    tool_name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        config = get_config()
+        if not config.get("tool_cache_enabled", True):
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        fields = {
+            "tool": tool_name,
+            "arguments": bound.arguments,
+            "config": {name: config.get(name) for name in TOOL_CONFIG_KEYS},
+        }
+        key = hashlib.sha256(
+            json.dumps(fields, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+        cache = get_tool_cache()
+        found, value = cache.get(tool_name, key)
+        if found:
+            return _detached(value)
+        value = func(*args, **kwargs)
+        if isinstance(value, ErrorResult):
+            return value
+        ttl = config.get("tool_cache_ttl", {}).get(
+            tool_name, DEFAULT_TOOL_TTLS.get(tool_name, DEFAULT_TOOL_TTL)
+        )
+        if ttl:
+            cache.put(tool_name, key, _detached(value), ttl)
+        return value
+
+    return wrapper
@@ -1,8 +1,10 @@
 from .finnhub_utils import get_data_in_range
 from .googlenews_utils import getNewsData
 from .yfin_utils import YFinanceUtils
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import fetch_top_from_category, fetch_top_from_category_range
 from .stockstats_utils import StockstatsUtils
+from .price_store import PriceStore, get_price_store, get_online_price_frame
+from .simfin_store import SimFinStore, get_simfin_store
 from .yfin_utils import YFinanceUtils
 
 from .interface import (
@@ -0,0 +1,99 @@
+import glob
+import os
+from typing import Annotated, Callable, List
+
+import pandas as pd
+
+COLUMNAR_SUFFIX = ".parquet"
+
+SIMFIN_STATEMENTS = {
+    "balance_sheet": "us-balance",
+    "cash_flow": "us-cashflow",
+    "income_statements": "us-income",
+}
+SIMFIN_DATE_COLUMNS = ["Report Date", "Publish Date"]
+
+
+def columnar_path(csv_path: Annotated[str, "path of the csv file"]) -> str:
+    """Path of the columnar copy that sits next to a csv file."""
+    return os.path.splitext(csv_path)[0] + COLUMNAR_SUFFIX
+
+
+def resolve_table_path(csv_path: Annotated[str, "path of the csv file"]) -> str:
+    """Prefer the columnar copy of a csv when it exists and is not older than the csv."""
+    parquet_path = columnar_path(csv_path)
+    if not os.path.exists(parquet_path):
+        return csv_path
+    if os.path.exists(csv_path) and os.path.getmtime(parquet_path) < os.path.getmtime(
+        csv_path
+    ):
+        return csv_path
+    return parquet_path
+
+
+def read_table(
+    path: Annotated[str, "path of a csv or parquet file"],
+    csv_reader: Callable[[str], pd.DataFrame],
+) -> pd.DataFrame:
+    """Read a parquet file directly, or parse a csv with csv_reader."""
+    if path.endswith(COLUMNAR_SUFFIX):
+        return pd.read_parquet(path)
+    return csv_reader(path)
+
+
+def read_simfin_csv(path: Annotated[str, "path of a SimFin statement csv"]) -> pd.DataFrame:
+    """Parse a SimFin statement csv with normalized UTC report and publish dates."""
+    df = pd.read_csv(path, sep=";")
+    for column in SIMFIN_DATE_COLUMNS:
+        df[column] = pd.to_datetime(df[column], utc=True).dt.normalize()
+    return df
+
+
+def load_simfin_statement(
+    data_path: Annotated[str, "path of a SimFin statement csv"],
+) -> pd.DataFrame:
+    """Load a SimFin statement, preferring its columnar copy, with parsed date columns."""
+    return read_table(resolve_table_path(data_path), read_simfin_csv)
+
+
+def convert_to_columnar(
+    csv_path: Annotated[str, "path of the csv file to convert"],
+    csv_reader: Callable[[str], pd.DataFrame],
+) -> str:
+    """Parse a csv with csv_reader and write the typed result next to it as parquet."""
+    parquet_path = columnar_path(csv_path)
+    csv_reader(csv_path).to_parquet(parquet_path)
+    return parquet_path
+
+
+def convert_data_dir(
+    data_dir: Annotated[str, "root directory of the offline datasets"],
+) -> List[str]:
+    """Convert the YFin price files and SimFin statements under data_dir to parquet."""
+    # imported here to avoid a circular import, price_store reads through this module
+    from .price_store import read_price_csv
+
+    converted = []
+
+    price_files = glob.glob(
+        os.path.join(data_dir, "market_data", "price_data", "*-YFin-data-*.csv")
+    )
+    for csv_path in sorted(price_files):
+        converted.append(convert_to_columnar(csv_path, read_price_csv))
+
+    for statement, prefix in SIMFIN_STATEMENTS.items():
+        statement_files = glob.glob(
+            os.path.join(
+                data_dir,
+                "fundamental_data",
+                "simfin_data_all",
+                statement,
+                "companies",
+                "us",
+                f"{prefix}-*.csv",
+            )
+        )
+        for csv_path in sorted(statement_files):
+            converted.append(convert_to_columnar(csv_path, read_simfin_csv))
+
+    return converted
@@ -1,5 +1,46 @@
 import json
 import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+# parsed finnhub files, keyed by path: (mtime_ns, size) -> (sorted keys, key positions, data)
+_FINNHUB_CACHE_MAX_FILES = 128
+_finnhub_cache = OrderedDict()
+_finnhub_cache_lock = threading.Lock()
+
+
+def load_indexed_data(data_path):
+    """
+    Loads a formatted finnhub json file once and keeps it in memory with a sorted key index.
+    The cached entry is reloaded when the file's mtime or size changes.
+    Args:
+        data_path (str): Path of the {ticker}_data_formatted.json file.
+    Returns:
+        tuple: (sorted date keys, original position of each key, parsed data). Treat as read-only.
+    """
+    stat = os.stat(data_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _finnhub_cache_lock:
+        entry = _finnhub_cache.get(data_path)
+        if entry is not None and entry[0] == stamp:
+            _finnhub_cache.move_to_end(data_path)
+            return entry[1]
+
+    with open(data_path, "r") as f:
+        data = json.load(f)
+
+    positions = {key: i for i, key in enumerate(data)}
+    indexed = (sorted(data), positions, data)
+
+    with _finnhub_cache_lock:
+        _finnhub_cache[data_path] = (stamp, indexed)
+        _finnhub_cache.move_to_end(data_path)
+        while len(_finnhub_cache) > _FINNHUB_CACHE_MAX_FILES:
+            _finnhub_cache.popitem(last=False)
+
+    return indexed
 
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
@@ -25,12 +66,16 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
+    sorted_keys, positions, data = load_indexed_data(data_path)
+
+    # bisect the keys (date, str in format YYYY-MM-DD) for the date range (str, str in format YYYY-MM-DD)
+    lo = bisect_left(sorted_keys, start_date)
+    hi = bisect_right(sorted_keys, end_date)
 
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
+    # keep the order of the file
     filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
+    for key in sorted(sorted_keys[lo:hi], key=positions.__getitem__):
+        value = data[key]
+        if len(value) > 0:
             filtered_data[key] = value
     return filtered_data
@@ -1,16 +1,18 @@
 from typing import Annotated, Dict
-from .reddit_utils import fetch_top_from_category
+from .reddit_utils import fetch_top_from_category, fetch_top_from_category_range
 from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .price_store import get_price_frame
+from .simfin_store import get_simfin_store
+from .utils import ErrorResult
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
 import pandas as pd
-from tqdm import tqdm
 import yfinance as yf
 from openai import OpenAI
 from .config import get_config, set_config, DATA_DIR
@@ -58,6 +60,21 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+def _unique_entries(data: Dict[str, list]):
+    """Yield every distinct entry of a {date: [entry, ...]} mapping once, in order.
+
+    Entries are de-duplicated on a canonical json key, so the cost is linear
+    instead of comparing each entry against every entry seen so far.
+    """
+    seen = set()
+    for entries in data.values():
+        for entry in entries:
+            key = json.dumps(entry, sort_keys=True, default=str)
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -84,13 +101,10 @@ def get_finnhub_company_insider_sentiment(
     if len(data) == 0:
         return ""
 
-    result_str = ""
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+    result_str = "".join(
+        f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
+        for entry in _unique_entries(data)
+    )
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
@@ -125,14 +139,10 @@ def get_finnhub_company_insider_transactions(
     if len(data) == 0:
         return ""
 
-    result_str = ""
-
-    seen_dicts = []
-    for date, senti_list in data.items():
-        for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+    result_str = "".join(
+        f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+        for entry in _unique_entries(data)
+    )
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
@@ -158,26 +168,14 @@ def get_simfin_balance_sheet(
         "us",
         f"us-balance-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Binary search the latest report published on or before the current date
+    latest_balance_sheet = get_simfin_store().latest_report(data_path, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -205,26 +203,14 @@ def get_simfin_cashflow(
         "us",
         f"us-cashflow-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Binary search the latest report published on or before the current date
+    latest_cash_flow = get_simfin_store().latest_report(data_path, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -252,26 +238,14 @@ def get_simfin_income_statements(
         "us",
         f"us-income-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Binary search the latest report published on or before the current date
+    latest_income = get_simfin_store().latest_report(data_path, ticker, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -326,26 +300,16 @@ def get_reddit_global_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {start_date}", total=total_iterations)
+    curr_date = start_date.strftime("%Y-%m-%d")
 
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            max_limit_per_day,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # one indexed range query instead of re-reading every file for each day
+    posts = fetch_top_from_category_range(
+        "global_news",
+        before,
+        curr_date,
+        max_limit_per_day,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
 
     if len(posts) == 0:
         return ""
@@ -380,32 +344,18 @@ def get_reddit_company_news(
     before = start_date - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = datetime.strptime(before, "%Y-%m-%d")
+    curr_date = start_date.strftime("%Y-%m-%d")
 
-    total_iterations = (start_date - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {ticker} on {start_date}",
-        total=total_iterations,
+    # one indexed range query instead of re-reading every file for each day
+    posts = fetch_top_from_category_range(
+        "company_news",
+        before,
+        curr_date,
+        max_limit_per_day,
+        ticker,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
     )
 
-    while curr_date <= start_date:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            max_limit_per_day,
-            ticker,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
-
     if len(posts) == 0:
         return ""
 
@@ -511,38 +461,38 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # load the price history and compute the indicator once for the whole window
+    try:
+        window_values = StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicator,
+            end_date,
+            look_back_days,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
+    except Exception as e:
+        error = f"Error getting stockstats indicator data for indicator {indicator} on {end_date}: {e}"
+        print(error)
+        # report the failure itself, an empty window would read as a run of holidays
+        ind_string = f"{error}\n"
+        window_values = None
+    else:
+        values_by_date = {
+            date.strftime("%Y-%m-%d"): str(value) for date, value in window_values.items()
+        }
 
         ind_string = ""
         while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
+            curr_date_str = curr_date.strftime("%Y-%m-%d")
+            if curr_date_str in values_by_date:
+                ind_string += f"{curr_date_str}: {values_by_date[curr_date_str]}\n"
+            elif online:
+                # offline output only lists trading dates, online marks the gaps
+                ind_string += (
+                    f"{curr_date_str}: N/A: Not a trading day (weekend or holiday)\n"
                 )
 
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
-
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
             curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
@@ -552,6 +502,8 @@ def get_stock_stats_indicators_window(
         + best_ind_params.get(indicator, "No description available.")
     )
 
+    if window_values is None:
+        return ErrorResult(result_str)
     return result_str
 
 
@@ -579,7 +531,7 @@ def get_stockstats_indicator(
         print(
             f"Error getting stockstats indicator data for indicator {indicator} on {curr_date}: {e}"
         )
-        return ""
+        return ErrorResult("")
 
     return str(indicator_value)
 
@@ -595,23 +547,13 @@ def get_YFin_data_window(
     start_date = before.strftime("%Y-%m-%d")
 
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
-
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    data = get_price_frame(symbol, os.path.join(DATA_DIR, "market_data", "price_data"))
 
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    # Filter data between the start and end dates (inclusive), labelling rows with
+    # their position in the file as the csv read did (YFin files are date-ordered)
+    first = data.index.searchsorted(pd.Timestamp(start_date), side="left")
+    last = data.index.searchsorted(pd.Timestamp(curr_date), side="right")
+    filtered_data = data.iloc[first:last].set_axis(pd.RangeIndex(first, last), axis=0)
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -673,31 +615,15 @@ def get_YFin_data(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    data = get_price_frame(symbol, os.path.join(DATA_DIR, "market_data", "price_data"))
 
     if end_date > "2025-03-25":
         raise Exception(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
-    # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
-    # remove the index from the dataframe
-    filtered_data = filtered_data.reset_index(drop=True)
+    # Filter data between the start and end dates (inclusive) and remove the date index
+    filtered_data = data.loc[start_date:end_date].reset_index(drop=True)
 
     return filtered_data
 
@@ -0,0 +1,271 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Annotated, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from pandas.tseries.offsets import BDay
+
+from .columnar import read_table, resolve_table_path
+from .config import get_config
+
+
+def read_price_csv(path: Annotated[str, "path to a YFin price csv"]) -> pd.DataFrame:
+    """Parse a YFin price csv into a frame indexed by trading date.
+
+    The original columns (including the raw Date strings) are kept untouched so
+    that callers can reproduce the exact file contents for a date range.
+    """
+    data = pd.read_csv(path)
+    data.index = pd.DatetimeIndex(pd.to_datetime(data["Date"].astype(str).str[:10]))
+    return data.sort_index(kind="stable")
+
+
+def read_price_table(path: Annotated[str, "path of a YFin price csv or parquet"]) -> pd.DataFrame:
+    """Read a price file in either format into the date-indexed frame layout."""
+    return read_table(path, read_price_csv)
+
+
+class PriceStore:
+    """Process-wide LRU cache of parsed price frames.
+
+    Entries are keyed by file path, evicted least-recently-used first once either
+    the entry limit or the memory budget is exceeded, and reloaded whenever the
+    file's mtime or size changes. Returned frames are shared between callers and
+    must be treated as read-only; copy before adding columns.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _file_stamp(path: str) -> tuple:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(
+        self,
+        path: Annotated[str, "path of the price file to load"],
+        loader: Optional[Callable[[str], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        """Return the parsed frame for path, loading it on a miss or a stale entry."""
+        path = os.path.abspath(path)
+        stamp = self._file_stamp(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        frame = (loader or read_price_table)(path)
+        size = int(frame.memory_usage(deep=True).sum())
+
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._total_bytes -= old[2]
+            self._entries[path] = (stamp, frame, size)
+            self._total_bytes += size
+            self._evict()
+
+        return frame
+
+    def _evict(self):
+        # always keep the most recent entry, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop one cached path, or every entry when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._total_bytes = 0
+                return
+            entry = self._entries.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self._total_bytes -= entry[2]
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+
+_price_store: Optional[PriceStore] = None
+_price_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """Get the shared price store, creating it from the current config on first use."""
+    global _price_store
+    with _price_store_lock:
+        if _price_store is None:
+            config = get_config()
+            _price_store = PriceStore(
+                max_entries=config.get("price_cache_max_entries", 256),
+                max_bytes=int(config.get("price_cache_max_mb", 512) * 1024 * 1024),
+            )
+        return _price_store
+
+
+def get_price_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    data_dir: Annotated[str, "directory where the YFin price files are stored"],
+) -> pd.DataFrame:
+    """Get the cached, DatetimeIndex-ed offline YFin frame for a symbol.
+
+    Reads the columnar copy of the csv when one has been converted.
+    """
+    csv_path = os.path.join(data_dir, f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv")
+    return get_price_store().get(resolve_table_path(csv_path))
+
+
+def download_yfin_prices(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format, exclusive"],
+) -> pd.DataFrame:
+    """Download adjusted daily bars from Yahoo Finance as a frame with a Date column."""
+    data = yf.download(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    return data.reset_index()
+
+
+def local_price_downloader(
+    source_dir: Annotated[str, "directory holding offline YFin price csv files"],
+) -> Callable[[str, str, str], pd.DataFrame]:
+    """Build a stand-in for download_yfin_prices that serves bars from offline csv files.
+
+    Useful for exercising the online cache without network access.
+    """
+
+    def download(symbol, start_date, end_date):
+        frame = get_price_frame(symbol, source_dir)
+        last_day = pd.Timestamp(end_date) - pd.Timedelta(days=1)
+        return frame.loc[start_date:last_day].reset_index(drop=True)
+
+    return download
+
+
+_online_cache_locks: Dict[str, threading.Lock] = {}
+
+# Trading days re-downloaded before the last cached bar to detect a re-adjusted history
+ONLINE_OVERLAP_DAYS = 5
+# Relative close difference beyond which the cached history counts as stale
+ONLINE_ADJUSTMENT_TOLERANCE = 1e-4
+
+
+def _adjustment_changed(frame: pd.DataFrame, overlap: pd.DataFrame) -> bool:
+    """Whether freshly downloaded bars disagree with the cached closes of the same days."""
+    if overlap.empty or "Close" not in overlap.columns:
+        return False
+    cached = frame["Close"].copy()
+    cached.index = cached.index.strftime("%Y-%m-%d")
+    fresh = overlap.set_index(overlap["Date"].str[:10])["Close"]
+    common = fresh.index.intersection(cached.index)
+    if common.empty:
+        return False
+    cached_close = cached.loc[common].astype(float).to_numpy()
+    fresh_close = fresh.loc[common].astype(float).to_numpy()
+    return not np.allclose(fresh_close, cached_close, rtol=ONLINE_ADJUSTMENT_TOLERANCE, atol=0.0)
+
+
+def get_online_price_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    cache_dir: Annotated[str, "directory where the online price cache is stored"],
+    downloader: Optional[Callable[[str, str, str], pd.DataFrame]] = None,
+    history_years: Annotated[int, "years of history for the first download"] = 15,
+    today: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """Get the online price history for a symbol from a date-stable per-symbol cache.
+
+    The first call downloads history_years of bars and persists them to
+    {symbol}-YFin-data.csv. Later calls download the bars after the last cached
+    date, plus a few days of overlap, and append the new ones to the file, at
+    most once per day. Bars are split and dividend adjusted, so when the overlap
+    no longer matches the cached closes the whole history was re-adjusted and is
+    downloaded again instead.
+    """
+    downloader = downloader or download_yfin_prices
+    today = (today or pd.Timestamp.today()).normalize()
+    end_date = today.strftime("%Y-%m-%d")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    data_file = os.path.join(cache_dir, f"{symbol}-YFin-data.csv")
+    store = get_price_store()
+
+    with _online_cache_locks.setdefault(data_file, threading.Lock()):
+        frame = store.get(data_file) if os.path.exists(data_file) else None
+
+        def download_history():
+            start_date = (today - pd.DateOffset(years=history_years)).strftime(
+                "%Y-%m-%d"
+            )
+            data = downloader(symbol, start_date, end_date)
+            _format_dates(data).to_csv(data_file, index=False)
+
+        if frame is None or frame.empty:
+            download_history()
+        else:
+            last_date = frame.index.max()
+            checked_on = pd.Timestamp.fromtimestamp(os.path.getmtime(data_file)).normalize()
+
+            # bars up to the previous business day are final; skip if already checked today
+            if last_date < today - BDay(1) and checked_on < today:
+                start_date = (last_date - BDay(ONLINE_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+                fetched = _format_dates(downloader(symbol, start_date, end_date))
+                last_day = last_date.strftime("%Y-%m-%d")
+                overlap = fetched[fetched["Date"].str[:10] <= last_day]
+                tail = fetched[fetched["Date"].str[:10] > last_day]
+
+                if _adjustment_changed(frame, overlap):
+                    # a split or dividend re-adjusted the history, appending would leave a break
+                    download_history()
+                elif tail.empty:
+                    # nothing new (holiday or weekend), just record the check
+                    os.utime(data_file)
+                else:
+                    tail.reindex(columns=frame.columns).to_csv(
+                        data_file, mode="a", header=False, index=False
+                    )
+
+        return store.get(data_file)
+
+
+def _format_dates(data: pd.DataFrame) -> pd.DataFrame:
+    """Render a downloaded Date column as YYYY-mm-dd strings for the csv cache."""
+    data = data.copy()
+    if pd.api.types.is_datetime64_any_dtype(data["Date"]):
+        data["Date"] = data["Date"].dt.strftime("%Y-%m-%d")
+    else:
+        data["Date"] = data["Date"].astype(str)
+    return data
@@ -1,11 +1,14 @@
 import requests
 import time
 import json
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict, List
 import os
 import re
+import threading
+import heapq
+from functools import lru_cache
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +52,233 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+# parsed on-disk indexes, keyed by index path: (source mtime_ns, size) -> {date: [byte offsets]}
+_reddit_index_cache = {}
+_reddit_index_lock = threading.Lock()
+
+
+def _post_date(created_utc) -> str:
+    return datetime.fromtimestamp(created_utc, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _index_path(base_path: str, category: str, data_file: str) -> str:
+    # kept outside the category folder, whose file count sets the per-subreddit limit
+    return os.path.join(base_path, ".index", category, f"{data_file}.json")
+
+
+def load_subreddit_index(
+    file_path: Annotated[str, "Path of a subreddit .jsonl file."],
+    index_path: Annotated[str, "Path of the on-disk index for that file."],
+) -> Dict[str, List[int]]:
+    """
+    Load the date-partitioned index of a subreddit .jsonl file, building it with a
+    single pass over the file when it is missing or the file has changed since.
+    Returns a mapping of YYYY-mm-dd to the byte offsets of the posts created that day.
+    """
+    stat = os.stat(file_path)
+    stamp = [stat.st_mtime_ns, stat.st_size]
+
+    with _reddit_index_lock:
+        cached = _reddit_index_cache.get(index_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    dates = None
+    if os.path.exists(index_path):
+        with open(index_path, "r") as f:
+            stored = json.load(f)
+        if stored.get("source") == stamp:
+            dates = stored["dates"]
+
+    if dates is None:
+        dates = {}
+        offset = 0
+        with open(file_path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    created_utc = json.loads(line)["created_utc"]
+                    dates.setdefault(_post_date(created_utc), []).append(offset)
+                offset += len(line)
+
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(index_path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"source": stamp, "dates": dates}, f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            # read-only dataset: keep the index for this process only
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    with _reddit_index_lock:
+        _reddit_index_cache[index_path] = (stamp, dates)
+
+    return dates
+
+
+def build_reddit_index(
+    data_path: Annotated[str, "Path to the reddit data folder."] = "reddit_data",
+) -> List[str]:
+    """Build (or refresh) the date index of every subreddit file in every category."""
+    indexed = []
+    for category in sorted(os.listdir(data_path)):
+        category_path = os.path.join(data_path, category)
+        if category.startswith(".") or not os.path.isdir(category_path):
+            continue
+        for data_file in sorted(os.listdir(category_path)):
+            if not data_file.endswith(".jsonl"):
+                continue
+            index_path = _index_path(data_path, category, data_file)
+            load_subreddit_index(os.path.join(category_path, data_file), index_path)
+            indexed.append(index_path)
+    return indexed
+
+
+@lru_cache(maxsize=None)
+def company_matcher(query: Annotated[str, "ticker symbol of the company"]):
+    """
+    Compile the company name aliases and the ticker into a single case-insensitive
+    alternation, equivalent to searching for each term separately.
+    """
+    search_terms = ticker_to_company[query].split(" OR ")
+    search_terms.append(query)
+    return re.compile("|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE)
+
+
+def _iter_day_posts(f, days, dates):
+    """Yield (day, parsed post) in file order, through the date index when given one."""
+    if dates is not None:
+        for day in days:
+            for offset in dates.get(day, []):
+                f.seek(offset)
+                yield day, json.loads(f.readline())
+        return
+
+    # single streaming pass over the file for the whole range
+    wanted_days = set(days)
+    for line in f:
+        # skip empty lines
+        if not line.strip():
+            continue
+        parsed_line = json.loads(line)
+        day = _post_date(parsed_line["created_utc"])
+        if day in wanted_days:
+            yield day, parsed_line
+
+
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
+    use_index: Annotated[
+        bool, "Read through the on-disk date index instead of streaming each file once."
+    ] = True,
 ):
+    """
+    Fetch the top posts of every day in [start_date, end_date] with one pass per file,
+    either through the date index (only the lines of those days are read) or by
+    streaming the file once. A bounded heap keeps the top posts per subreddit per day.
+    Posts are returned day by day, in the same order as per-day fetches.
+    """
     base_path = data_path
+    category_path = os.path.join(base_path, category)
+    data_files = os.listdir(category_path)
 
-    all_content = []
-
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < len(data_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // len(data_files)
+
+    days = []
+    curr_date = datetime.strptime(start_date, "%Y-%m-%d")
+    last_date = datetime.strptime(end_date, "%Y-%m-%d")
+    while curr_date <= last_date:
+        days.append(curr_date.strftime("%Y-%m-%d"))
+        curr_date += timedelta(days=1)
+
+    # if is company_news, the title or the content must mention the company's name (query)
+    matcher = company_matcher(query) if "company" in category and query else None
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
+    # day -> per-subreddit top posts, in listdir order
+    content_by_day = {day: [] for day in days}
+
+    for data_file in data_files:
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
+        file_path = os.path.join(category_path, data_file)
+        dates = None
+        if use_index:
+            dates = load_subreddit_index(
+                file_path, _index_path(base_path, category, data_file)
+            )
 
-                parsed_line = json.loads(line)
+        # day -> min-heap of (upvotes, -position, post); on equal upvotes the later post is dropped first
+        top_by_day = {day: [] for day in days}
 
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
+        with open(file_path, "rb") as f:
+            for position, (day, parsed_line) in enumerate(
+                _iter_day_posts(f, days, dates)
+            ):
+                if matcher is not None and not (
+                    matcher.search(parsed_line["title"])
+                    or matcher.search(parsed_line["selftext"])
+                ):
                     continue
 
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
+                entry = (parsed_line["ups"], -position, parsed_line)
+                heap = top_by_day[day]
+                if len(heap) < limit_per_subreddit:
+                    heapq.heappush(heap, entry)
+                elif entry[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, entry)
 
-                    search_terms.append(query)
+        for day in days:
+            # highest upvotes first, file order among ties
+            for _, _, parsed_line in sorted(
+                top_by_day[day], key=lambda x: (-x[0], -x[1])
+            ):
+                content_by_day[day].append(
+                    {
+                        "title": parsed_line["title"],
+                        "content": parsed_line["selftext"],
+                        "url": parsed_line["url"],
+                        "upvotes": parsed_line["ups"],
+                        "posted_date": day,
+                    }
+                )
 
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+    all_content = []
+    for day in days:
+        all_content.extend(content_by_day[day])
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    return all_content
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
 
-    return all_content
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query=query, data_path=data_path
+    )
@@ -0,0 +1,93 @@
+import os
+import threading
+from typing import Annotated, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .columnar import load_simfin_statement, resolve_table_path
+
+
+class _StatementIndex:
+    """A SimFin statement sorted by (Ticker, Publish Date) with per-ticker row bounds."""
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.dropna(subset=["Ticker", "Publish Date"])
+        # stable sort keeps the original row order among equal publish dates
+        self.df = df.sort_values(["Ticker", "Publish Date"], kind="stable")
+        self.publish_dates = pd.DatetimeIndex(self.df["Publish Date"]).asi8
+
+        codes, tickers = pd.factorize(self.df["Ticker"])
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else []
+        stops = list(starts[1:]) + [len(codes)]
+        self.bounds: Dict[str, Tuple[int, int]] = {
+            tickers[codes[start]]: (start, stop) for start, stop in zip(starts, stops)
+        }
+
+    def latest(self, ticker: str, curr_date) -> Optional[pd.Series]:
+        if ticker not in self.bounds:
+            return None
+        start, stop = self.bounds[ticker]
+        ticker_dates = self.publish_dates[start:stop]
+
+        curr_date_ns = pd.to_datetime(curr_date, utc=True).normalize().value
+        last = np.searchsorted(ticker_dates, curr_date_ns, side="right") - 1
+        if last < 0:
+            return None
+
+        # several rows can share the latest publish date, return the first one like idxmax
+        first = np.searchsorted(ticker_dates, ticker_dates[last], side="left")
+        return self.df.iloc[start + first]
+
+
+class SimFinStore:
+    """Loads each SimFin statement file once and answers point-in-time lookups.
+
+    Statements are reloaded when the underlying csv (or its columnar copy) changes.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, Tuple[tuple, _StatementIndex]] = {}
+        self._lock = threading.Lock()
+
+    def _get_index(self, data_path: str) -> _StatementIndex:
+        table_path = resolve_table_path(data_path)
+        stat = os.stat(table_path)
+        stamp = (table_path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._indexes.get(data_path)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+        index = _StatementIndex(load_simfin_statement(data_path))
+        with self._lock:
+            self._indexes[data_path] = (stamp, index)
+        return index
+
+    def latest_report(
+        self,
+        data_path: Annotated[str, "path of a SimFin statement csv"],
+        ticker: Annotated[str, "ticker symbol"],
+        curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    ) -> Optional[pd.Series]:
+        """Return the most recent statement row for ticker published on or before curr_date."""
+        return self._get_index(data_path).latest(ticker, curr_date)
+
+    def clear(self):
+        """Drop every loaded statement."""
+        with self._lock:
+            self._indexes.clear()
+
+
+_simfin_store: Optional[SimFinStore] = None
+_simfin_store_lock = threading.Lock()
+
+
+def get_simfin_store() -> SimFinStore:
+    """Get the shared SimFin store."""
+    global _simfin_store
+    with _simfin_store_lock:
+        if _simfin_store is None:
+            _simfin_store = SimFinStore()
+        return _simfin_store
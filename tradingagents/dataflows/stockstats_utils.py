@@ -1,21 +1,15 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .price_store import get_price_frame, get_online_price_frame
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def _load_stock_data(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -24,58 +18,45 @@ class StockstatsUtils:
             bool,
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
-    ):
-        df = None
-        data = None
-
+    ) -> pd.DataFrame:
+        """Load the price history for a symbol with its Date column as YYYY-mm-dd strings."""
         if not online:
             try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
+                price_frame = get_price_frame(symbol, data_dir)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
+            # incremental per-symbol cache, only the missing tail bars are downloaded
             config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
+            price_frame = get_online_price_frame(symbol, config["data_cache_dir"])
 
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
+        # the cached frame is shared, so work on a copy
+        data = price_frame.reset_index(drop=True)
+        data["Date"] = price_frame.index.strftime("%Y-%m-%d")
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+        return data
 
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        data = StockstatsUtils._load_stock_data(symbol, data_dir, online)
+        df = wrap(data)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
         df[indicator]  # trigger stockstats to calculate the indicator
         matching_rows = df[df["Date"].str.startswith(curr_date)]
@@ -85,3 +66,43 @@ class StockstatsUtils:
             return indicator_value
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """
+        Compute an indicator once over the full price history and return its
+        values for the trading days in [curr_date - look_back_days, curr_date].
+
+        Returns:
+            pd.Series: indicator values indexed by trading date (ascending)
+        """
+        data = StockstatsUtils._load_stock_data(symbol, data_dir, online)
+        df = wrap(data)
+
+        values = pd.Series(
+            df[indicator].values,
+            index=pd.to_datetime(df["Date"]),
+            name=indicator,
+        ).sort_index()
+
+        end_date = pd.to_datetime(curr_date)
+        start_date = end_date - pd.DateOffset(days=look_back_days)
+
+        return values.loc[start_date:end_date]
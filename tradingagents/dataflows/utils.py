@@ -12,6 +12,14 @@ def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) ->
         print(f"{tag} saved to {save_path}")
 
 
+class ErrorResult(str):
+    """A data function result that reports a failure instead of data.
+
+    It reads as the plain message wherever a string is expected, and tells the
+    tool cache not to keep it, so the next call tries the source again.
+    """
+
+
 def get_current_date():
     return date.today().strftime("%Y-%m-%d")
 
@@ -8,17 +8,59 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    # Data cache settings
+    "price_cache_max_entries": 256,
+    "price_cache_max_mb": 512,
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # Directory for the on-disk LLM response cache, None disables it
+    "llm_cache_dir": os.getenv("TRADINGAGENTS_LLM_CACHE_DIR"),
+    "llm_cache_max_entries": 50000,
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Run the selected analysts as parallel branches instead of one after another
+    "parallel_analysts": False,
+    # Memory settings
+    # Embedding provider: "openai" (API at backend_url), "local" (sentence-transformers in-process) or "hashing"
+    "embedding_provider": "openai",
+    "embedding_model": None,
+    "embedding_device": "cpu",
+    "embedding_cache_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
+        "dataflows/data_cache/embeddings",
+    ),
+    "embedding_batch_size": 128,
+    "embedding_max_workers": 4,
+    "embedding_max_retries": 5,
+    # Memory backend: "chroma", or "numpy" for a brute-force float32 index (memory_mmap maps it from disk)
+    "memory_backend": "chroma",
+    "memory_mmap": False,
+    # Seconds the numpy backend may hold back retrieval-time updates before writing them
+    "memory_flush_interval": 60.0,
+    # Directory for persistent memories, None keeps them in memory for the process only
+    "memory_persist_dir": os.getenv("TRADINGAGENTS_MEMORY_DIR"),
+    "memory_collection_version": 1,
+    # Optional cap on entries per memory, evicting by "lru" (last retrieval) or "age"
+    "memory_max_entries": None,
+    "memory_eviction": "lru",
+    # Number of final states kept in memory, every state is appended to the state log
+    "state_log_retention": 32,
+    # Opt-in directory for reusing finished runs with the same ticker, date, analysts,
+    # models, prompts and memories, None disables it
+    "result_cache_dir": os.getenv("TRADINGAGENTS_RESULT_CACHE_DIR"),
     # Tool settings
     "online_tools": True,
+    # Tool results are memoized in memory, and on disk when tool_cache_dir is set
+    "tool_cache_enabled": True,
+    "tool_cache_max_entries": 512,
+    "tool_cache_dir": None,
+    # Per-tool TTLs in seconds, overriding tool_cache.DEFAULT_TOOL_TTLS
+    "tool_cache_ttl": {},
     # Language settings
     "language": "spanish",
     "language_instruction": "IMPORTANTE: Responde SIEMPRE en español. Todos los análisis, reportes y decisiones deben estar en español."
@@ -6,6 +6,9 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .backtest import Backtester
+from .state_log import iter_state_log, read_state_log, state_log_path
+from .llm_cache import SQLiteLLMCache
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +17,9 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "Backtester",
+    "iter_state_log",
+    "read_state_log",
+    "state_log_path",
+    "SQLiteLLMCache",
 ]
@@ -0,0 +1,196 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from tradingagents.dataflows.price_store import get_online_price_frame, get_price_frame
+from tradingagents.graph.signal_processing import normalize_decision
+
+# Direction of the position each decision opens
+POSITION_SIGN = {"BUY": 1, "SELL": -1, "HOLD": 0}
+
+
+def business_days(start_date: str, end_date: str) -> List[str]:
+    """Business days between start_date and end_date inclusive, as yyyy-mm-dd.
+
+    Exchange holidays are included, Backtester.run skips the days without a bar.
+    """
+    return [day.strftime("%Y-%m-%d") for day in pd.bdate_range(start_date, end_date)]
+
+
+class Backtester:
+    """Sweeps a (ticker, date) grid through one warm TradingAgentsGraph.
+
+    Every step shares the graph's compiled workflow, LLM clients, memories and
+    data caches. Completed steps are appended to a JSON Lines checkpoint, so a
+    run that is killed resumes with the steps it had not finished.
+
+    With reflect enabled each step is followed by reflect_and_remember using the
+    realized position return over holding_days trading days, read from the
+    cached price data. Steps running concurrently can then see memories written
+    for dates inside their own holding window; use max_concurrency=1 for strict
+    point-in-time memories.
+    """
+
+    def __init__(
+        self,
+        graph,
+        checkpoint_path: str,
+        max_concurrency: int = 4,
+        reflect: bool = False,
+        holding_days: int = 1,
+    ):
+        self.graph = graph
+        self.checkpoint_path = checkpoint_path
+        self.max_concurrency = max_concurrency
+        self.reflect = reflect
+        self.holding_days = holding_days
+
+    def load_checkpoint(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Read the completed steps, keyed by (ticker, trade_date)."""
+        completed = {}
+        if not os.path.exists(self.checkpoint_path):
+            return completed
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    step = json.loads(line)
+                except json.JSONDecodeError:
+                    # a line cut short when the previous run was killed
+                    continue
+                completed[(step["ticker"], step["trade_date"])] = step
+        return completed
+
+    def _end_partial_line(self):
+        # start the next record on a fresh line after a write that was cut short
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _record(self, step: Dict[str, Any]):
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(step, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _price_frame(self, ticker: str) -> pd.DataFrame:
+        config = self.graph.config
+        if config["online_tools"]:
+            return get_online_price_frame(ticker, config["data_cache_dir"])
+        return get_price_frame(
+            ticker, os.path.join(config["data_dir"], "market_data", "price_data")
+        )
+
+    def realized_return(self, ticker: str, trade_date: str) -> Optional[float]:
+        """Close-to-close return from trade_date to holding_days trading days later.
+
+        Returns None when trade_date has no close or the price history does not
+        reach far enough.
+        """
+        frame = self._price_frame(ticker)
+        column = "Adj Close" if "Adj Close" in frame.columns else "Close"
+        closes = frame[column].dropna()
+
+        entry = closes.index.searchsorted(pd.Timestamp(trade_date), side="right") - 1
+        exit_ = entry + self.holding_days
+        if entry < 0 or closes.index[entry] != pd.Timestamp(trade_date) or exit_ >= len(closes):
+            return None
+        return float(closes.iloc[exit_] / closes.iloc[entry] - 1.0)
+
+    def has_session(self, ticker: str, trade_dates: List[str]) -> Dict[str, bool]:
+        """Whether the market was open on each date, read from the cached price index.
+
+        Dates past the last cached bar, or every date when the prices cannot be
+        loaded, count as open since the history cannot tell.
+        """
+        try:
+            index = self._price_frame(ticker).index
+        except Exception:
+            return {trade_date: True for trade_date in trade_dates}
+        if len(index) == 0:
+            return {trade_date: True for trade_date in trade_dates}
+        bars = set(index.strftime("%Y-%m-%d"))
+        last_bar = index.max().strftime("%Y-%m-%d")
+        return {
+            trade_date: trade_date in bars or trade_date > last_bar
+            for trade_date in trade_dates
+        }
+
+    def run(
+        self, tickers: Iterable[str], trade_dates: Iterable[str]
+    ) -> Iterator[Dict[str, Any]]:
+        """Run every pending (ticker, date) step and yield each one as it completes.
+
+        Steps already in the checkpoint are skipped. Dates without a price bar
+        for the ticker (exchange holidays) are yielded as skipped without running
+        the agents. A failed step is yielded with its error and left out of the
+        checkpoint, so the next run retries it.
+        """
+        completed = self.load_checkpoint()
+        self._end_partial_line()
+        tickers = list(tickers)
+        trade_dates = [str(trade_date) for trade_date in trade_dates]
+        sessions = {ticker: self.has_session(ticker, trade_dates) for ticker in tickers}
+
+        pending = []
+        for trade_date in trade_dates:
+            for ticker in tickers:
+                if (ticker, trade_date) in completed:
+                    continue
+                if not sessions[ticker][trade_date]:
+                    yield {"ticker": ticker, "trade_date": trade_date, "skipped": "no trading session"}
+                    continue
+                pending.append((ticker, trade_date))
+
+        runs = self.graph.propagate_many(
+            pending, max_concurrency=self.max_concurrency, return_exceptions=True
+        )
+        for ticker, trade_date, result in runs:
+            if isinstance(result, Exception):
+                yield {"ticker": ticker, "trade_date": trade_date, "error": str(result)}
+                continue
+
+            final_state, decision = result
+            position = normalize_decision(decision)
+            if position is None:
+                # never score or remember a run whose decision we cannot read
+                yield {
+                    "ticker": ticker,
+                    "trade_date": trade_date,
+                    "error": f"unrecognized decision {decision!r}",
+                }
+                continue
+            step = {
+                "ticker": ticker,
+                "trade_date": trade_date,
+                "decision": position,
+                "return": None,
+                "position_return": None,
+            }
+
+            if self.reflect:
+                try:
+                    realized = self.realized_return(ticker, trade_date)
+                    if realized is not None:
+                        position_return = realized * POSITION_SIGN[position]
+                        step["return"] = realized
+                        step["position_return"] = position_return
+                        self.graph.reflect_and_remember(position_return, state=final_state)
+                except Exception as e:
+                    yield {"ticker": ticker, "trade_date": trade_date, "error": str(e)}
+                    continue
+
+            self._record(step)
+            yield step
@@ -0,0 +1,117 @@
+# TradingAgents/graph/llm_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+
+class SQLiteLLMCache(BaseCache):
+    """On-disk LangChain cache of chat model responses, bounded by entry count.
+
+    LangChain hands every lookup the serialized messages as prompt and an
+    llm_string holding the model class (so the provider), its constructor
+    arguments (model, temperature, base URL) and the call kwargs, including any
+    bound tools. Both are hashed into the key, so a prompt edit only misses for
+    the nodes whose input actually changed. Once max_entries is exceeded the
+    least recently used responses are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 50000):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "llm_cache.sqlite")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, generations TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for prompt and llm_string, or None."""
+        key = self.key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+        return loads(row[0], allowed_objects="core")
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        key = self.key(prompt, llm_string)
+        generations = dumps(list(return_val))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, last_used) VALUES (?, ?, ?)",
+                (key, generations, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def clear(self, **kwargs: Any):
+        """Drop every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of stored responses."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+            }
+
+
+_llm_caches = {}
+_llm_caches_lock = threading.Lock()
+
+
+def get_llm_cache(cache_dir: str, max_entries: int = 50000) -> SQLiteLLMCache:
+    """Get the process-wide SQLiteLLMCache for a directory."""
+    cache_dir = os.path.abspath(cache_dir)
+    with _llm_caches_lock:
+        if cache_dir not in _llm_caches:
+            _llm_caches[cache_dir] = SQLiteLLMCache(cache_dir, max_entries)
+        cache = _llm_caches[cache_dir]
+        cache.max_entries = max_entries
+        return cache
@@ -1,5 +1,6 @@
 # TradingAgents/graph/reflection.py
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 
@@ -119,3 +120,46 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
         risk_manager_memory.add_situations([(situation, result)])
+
+    def reflect_all(self, current_state, returns_losses, memories: Dict[str, Any]):
+        """Reflect on every role concurrently and update their memories.
+
+        memories maps "bull", "bear", "trader", "invest_judge" and "risk_manager"
+        to the memory of that role. The situation is extracted and embedded once
+        and shared by all of them.
+        """
+        situation = self._extract_current_situation(current_state)
+        reports = {
+            "bull": ("BULL", current_state["investment_debate_state"]["bull_history"]),
+            "bear": ("BEAR", current_state["investment_debate_state"]["bear_history"]),
+            "trader": ("TRADER", current_state["trader_investment_plan"]),
+            "invest_judge": (
+                "INVEST JUDGE",
+                current_state["investment_debate_state"]["judge_decision"],
+            ),
+            "risk_manager": (
+                "RISK JUDGE",
+                current_state["risk_debate_state"]["judge_decision"],
+            ),
+        }
+
+        first_memory = next(iter(memories.values()))
+        situation_embedding = first_memory.get_embedding(situation)
+
+        def reflect(role):
+            component_type, report = reports[role]
+            memory = memories[role]
+            result = self._reflect_on_component(
+                component_type, report, situation, returns_losses
+            )
+            # a memory using another embedding model embeds the situation itself
+            embeddings = (
+                [situation_embedding]
+                if memory.embedding == first_memory.embedding
+                else None
+            )
+            memory.add_situations([(situation, result)], embeddings=embeddings)
+
+        with ThreadPoolExecutor(max_workers=len(memories)) as executor:
+            # list() re-raises the first failed reflection
+            list(executor.map(reflect, memories))
@@ -0,0 +1,126 @@
+# TradingAgents/graph/result_cache.py
+
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+# Config entries that change what a run produces
+RESULT_CONFIG_KEYS = [
+    "llm_provider",
+    "backend_url",
+    "deep_think_llm",
+    "quick_think_llm",
+    "max_debate_rounds",
+    "max_risk_discuss_rounds",
+    "online_tools",
+    "language",
+    "language_instruction",
+]
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Modules whose text reaches the LLMs: the agent role prompts and the decision extraction
+PROMPT_SOURCES = [
+    "agents/analysts",
+    "agents/managers",
+    "agents/researchers",
+    "agents/risk_mgmt",
+    "agents/trader",
+    "graph/signal_processing.py",
+]
+
+
+def _prompt_files():
+    for source in PROMPT_SOURCES:
+        path = os.path.join(PACKAGE_DIR, *source.split("/"))
+        if os.path.isfile(path):
+            yield source, path
+            continue
+        for file_name in sorted(os.listdir(path)):
+            if file_name.endswith(".py"):
+                yield f"{source}/{file_name}", os.path.join(path, file_name)
+
+
+@lru_cache(maxsize=None)
+def prompt_version() -> str:
+    """Hash of everything a run shows the LLMs: the prompt modules and the tool descriptions.
+
+    Refactors elsewhere, such as in the graph wiring or data loaders, keep cached runs valid.
+    """
+    # imported here, the toolkit pulls in every data vendor
+    from tradingagents.agents.utils.agent_utils import Toolkit
+
+    digest = hashlib.sha256()
+    for name, path in _prompt_files():
+        digest.update(name.encode("utf-8"))
+        with open(path, "rb") as f:
+            # line endings depend on the checkout, not on the prompt
+            digest.update(f.read().replace(b"\r\n", b"\n"))
+
+    tools = {
+        name: {"description": value.__func__.description, "args": value.__func__.args}
+        for name, value in vars(Toolkit).items()
+        if isinstance(value, staticmethod) and hasattr(value.__func__, "description")
+    }
+    digest.update(json.dumps(tools, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Final states and decisions of past runs, stored as one JSON file per run key."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(
+        company_name: str,
+        trade_date: str,
+        selected_analysts: List[str],
+        config: Dict[str, Any],
+        memory_state: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Content address of a run: ticker, date, analysts, models, debate rounds, prompt version
+        and the fingerprint of each memory, so new lessons invalidate earlier runs."""
+        fields = {
+            "company_name": company_name,
+            "trade_date": str(trade_date),
+            "selected_analysts": list(selected_analysts),
+            "config": {name: config.get(name) for name in RESULT_CONFIG_KEYS},
+            "prompt_version": prompt_version(),
+            "memory_state": memory_state or {},
+        }
+        return hashlib.sha256(
+            json.dumps(fields, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], str]]:
+        """Return the cached (final_state, decision) for key, or None."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        final_state = cached["final_state"]
+        final_state["messages"] = messages_from_dict(final_state["messages"])
+        return final_state, cached["decision"]
+
+    def put(self, key: str, final_state: Dict[str, Any], decision: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        state = dict(final_state)
+        state["messages"] = messages_to_dict(final_state.get("messages", []))
+
+        # write then rename so a reader never sees a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"final_state": state, "decision": decision}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
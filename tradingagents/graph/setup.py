@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -15,6 +16,14 @@ from .conditional_logic import ConditionalLogic
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
+    # State field each analyst writes its report to
+    ANALYST_REPORT_KEYS = {
+        "market": "market_report",
+        "social": "sentiment_report",
+        "news": "news_report",
+        "fundamentals": "fundamentals_report",
+    }
+
     def __init__(
         self,
         quick_thinking_llm: ChatOpenAI,
@@ -40,8 +49,48 @@ class GraphSetup:
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
 
+    def _create_isolated_analyst(self, analyst_type, analyst_node, tool_node):
+        """Wrap an analyst and its tool loop so it runs on its own message channel.
+
+        The analyst loop is compiled as a separate graph and invoked with a private
+        copy of the messages, so parallel analysts never see each other's tool calls.
+        Only the analyst's report is written back to the shared state.
+        """
+        current_analyst = f"{analyst_type.capitalize()} Analyst"
+        current_tools = f"tools_{analyst_type}"
+        current_clear = f"Msg Clear {analyst_type.capitalize()}"
+        report_key = self.ANALYST_REPORT_KEYS[analyst_type]
+
+        analyst_workflow = StateGraph(AgentState)
+        analyst_workflow.add_node(current_analyst, analyst_node)
+        analyst_workflow.add_node(current_tools, tool_node)
+        analyst_workflow.add_edge(START, current_analyst)
+        analyst_workflow.add_conditional_edges(
+            current_analyst,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {current_tools: current_tools, current_clear: END},
+        )
+        analyst_workflow.add_edge(current_tools, current_analyst)
+        analyst_graph = analyst_workflow.compile()
+
+        def isolated_analyst_node(state, config: RunnableConfig):
+            analyst_state = dict(state)
+            analyst_state["messages"] = list(state["messages"])
+            final_state = analyst_graph.invoke(analyst_state, config)
+            return {report_key: final_state[report_key]}
+
+        async def aisolated_analyst_node(state, config: RunnableConfig):
+            analyst_state = dict(state)
+            analyst_state["messages"] = list(state["messages"])
+            final_state = await analyst_graph.ainvoke(analyst_state, config)
+            return {report_key: final_state[report_key]}
+
+        return RunnableLambda(isolated_analyst_node, afunc=aisolated_analyst_node)
+
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +100,9 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the selected analysts as parallel branches,
+                each with an isolated message channel, joined before the Bull
+                Researcher. If False, the analysts run one after another.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -113,6 +165,14 @@ class GraphSetup:
 
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
+            if parallel_analysts:
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_isolated_analyst(
+                        analyst_type, node, tool_nodes[analyst_type]
+                    ),
+                )
+                continue
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
@@ -130,30 +190,40 @@ class GraphSetup:
         workflow.add_node("Risk Judge", risk_manager_node)
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+        if parallel_analysts:
+            # Fan out to every analyst and join them before the Bull Researcher
+            analyst_names = [
+                f"{analyst_type.capitalize()} Analyst"
+                for analyst_type in selected_analysts
+            ]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            workflow.add_edge(analyst_names, "Bull Researcher")
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
+
+                # Connect to next analyst or to Bull Researcher if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -1,7 +1,73 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+import threading
+from typing import Dict, Optional
+
 from langchain_openai import ChatOpenAI
 
+DECISIONS = {
+    "buy": "BUY",
+    "comprar": "BUY",
+    "compra": "BUY",
+    "sell": "SELL",
+    "vender": "SELL",
+    "venta": "SELL",
+    "hold": "HOLD",
+    "mantener": "HOLD",
+}
+# the decision word has to stand alone: closed by emphasis, punctuation, the end of
+# the line, or a parenthesis or dash opening a qualifier ("BUY (moderate)", "SELL - weak"),
+# so "Sell-side analysts..." or "Hold off on buying" do not count
+_DECISION_WORD = (
+    r"(buy|sell|hold|comprar|compra|vender|venta|mantener)"
+    r"(?=\*{1,2}|_{1,2}|[ \t]*(?:[.!;:,()]|$)|[ \t]+[-–—][ \t])"
+)
+
+# "FINAL TRANSACTION PROPOSAL: **BUY**" / "PROPUESTA DE TRANSACCIÓN FINAL: **COMPRAR**"
+FINAL_PROPOSAL_PATTERN = re.compile(
+    r"(?:final\s+transaction\s+proposal|propuesta\s+de\s+transacci[oó]n\s+final)"
+    r"\s*:?[\s*_]*" + _DECISION_WORD,
+    re.IGNORECASE | re.MULTILINE,
+)
+# "Recomendación final: Mantener", "Decision: **SELL**"
+RECOMMENDATION_PATTERN = re.compile(
+    r"(?:recomendaci[oó]n|decisi[oó]n|recommendation|decision)(?:\s+final)?"
+    r"[\s*_]*:[\s*_]*" + _DECISION_WORD,
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def parse_decision(full_signal: str) -> Optional[str]:
+    """Read BUY, SELL or HOLD from the explicit markers of a decision text.
+
+    The last final-proposal marker wins. Without one, every "Recommendation:" or
+    "Decision:" line must agree. Returns None when the text is ambiguous.
+    """
+    proposals = FINAL_PROPOSAL_PATTERN.findall(full_signal)
+    if proposals:
+        return DECISIONS[proposals[-1].lower()]
+
+    recommendations = {
+        DECISIONS[word.lower()] for word in RECOMMENDATION_PATTERN.findall(full_signal)
+    }
+    if len(recommendations) == 1:
+        return recommendations.pop()
+    return None
+
+
+def normalize_decision(answer: str) -> Optional[str]:
+    """Map a short decision answer, as the LLM fallback gives it, to BUY, SELL or HOLD.
+
+    Accepts markdown and qualifiers around the word ("**Buy**", "COMPRAR",
+    "BUY (moderate)") and full decision texts with explicit markers. Returns
+    None for anything else.
+    """
+    first_word = re.match(r"[\W_]*([^\W\d_]+)", str(answer))
+    if first_word and first_word.group(1).lower() in DECISIONS:
+        return DECISIONS[first_word.group(1).lower()]
+    return parse_decision(str(answer))
+
 
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
@@ -9,18 +75,58 @@ class SignalProcessor:
     def __init__(self, quick_thinking_llm: ChatOpenAI):
         """Initialize with an LLM for processing."""
         self.quick_thinking_llm = quick_thinking_llm
+        self._lock = threading.Lock()
+        self.parsed = 0
+        self.llm_fallbacks = 0
 
     def process_signal(self, full_signal: str) -> str:
         """
         Process a full trading signal to extract the core decision.
 
+        The decision is parsed from the final-proposal markers when they are
+        unambiguous, the LLM is only asked otherwise.
+
         Args:
             full_signal: Complete trading signal text
 
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        decision = self._parse(full_signal)
+        if decision is not None:
+            return decision
+        response = self.quick_thinking_llm.invoke(self._extraction_messages(full_signal))
+        return self._validate(response.content)
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async version of process_signal, awaiting the LLM fallback."""
+        decision = self._parse(full_signal)
+        if decision is not None:
+            return decision
+        response = await self.quick_thinking_llm.ainvoke(
+            self._extraction_messages(full_signal)
+        )
+        return self._validate(response.content)
+
+    @staticmethod
+    def _validate(answer: str) -> str:
+        decision = normalize_decision(answer)
+        if decision is None:
+            raise ValueError(f"Could not read BUY, SELL or HOLD from the extracted decision: {answer!r}")
+        return decision
+
+    def _parse(self, full_signal: str) -> Optional[str]:
+        decision = parse_decision(full_signal)
+        with self._lock:
+            if decision is None:
+                self.llm_fallbacks += 1
+            else:
+                self.parsed += 1
+        return decision
+
+    @staticmethod
+    def _extraction_messages(full_signal: str):
+        return [
             (
                 "system",
                 "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information.",
@@ -28,4 +134,45 @@ class SignalProcessor:
             ("human", full_signal),
         ]
 
-        return self.quick_thinking_llm.invoke(messages).content
+    def stats(self) -> Dict[str, int]:
+        """Return how many signals were parsed by rule and how many went to the LLM."""
+        with self._lock:
+            return {"parsed": self.parsed, "llm_fallbacks": self.llm_fallbacks}
+
+
+if __name__ == "__main__":
+    # Parser checks, None means the LLM is asked
+    examples = [
+        ("FINAL TRANSACTION PROPOSAL: **BUY**", "BUY"),
+        ("PROPUESTA DE TRANSACCIÓN FINAL: **COMPRAR**", "BUY"),
+        ("Analysis...\nFINAL TRANSACTION PROPOSAL: HOLD\nLater: FINAL TRANSACTION PROPOSAL: SELL.", "SELL"),
+        ("Recomendación final: Mantener", "HOLD"),
+        ("Decision: **SELL** given the downside risk", "SELL"),
+        ("Decision: BUY (moderate)", "BUY"),
+        ("Recommendation: HOLD - wait for earnings", "HOLD"),
+        ("Recommendation: sell.\nDecision: Sell", "SELL"),
+        ("Recommendation: BUY\nDecision: HOLD", None),
+        ("Recommendation: BUY/HOLD/SELL", None),
+        ("Recommendation: Sell-side analysts suggest buy", None),
+        ("Decision: Hold off on buying until earnings", None),
+        ("Recomendación: Mantener la posición hasta el informe", None),
+        ("The market looks strong.", None),
+    ]
+    for text, expected in examples:
+        parsed = parse_decision(text)
+        assert parsed == expected, f"{text!r}: expected {expected}, got {parsed}"
+
+    # LLM fallback answers
+    answers = [
+        ("BUY", "BUY"),
+        ("**Sell**", "SELL"),
+        ("COMPRAR", "BUY"),
+        ("BUY (moderate)", "BUY"),
+        ("hold.", "HOLD"),
+        ("I cannot tell", None),
+        ("", None),
+    ]
+    for answer, expected in answers:
+        normalized = normalize_decision(answer)
+        assert normalized == expected, f"{answer!r}: expected {expected}, got {normalized}"
+    print(f"{len(examples) + len(answers)} decision texts parsed as expected")
@@ -0,0 +1,47 @@
+# TradingAgents/graph/state_log.py
+
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator
+
+_append_lock = threading.Lock()
+
+
+def state_log_path(ticker: str, log_dir: str = "eval_results") -> str:
+    """Path of the JSON Lines state log of a ticker."""
+    return os.path.join(log_dir, ticker, "TradingAgentsStrategy_logs", "full_states_log.jsonl")
+
+
+def append_state(path: str, entry: Dict[str, Any]):
+    """Append one logged state to a JSON Lines file as a single line."""
+    line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+    with _append_lock:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "ab+") as f:
+            # keep a line cut short by an interrupted write from swallowing this one
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = b"\n" + line
+            f.write(line)
+
+
+def iter_state_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the logged states of a JSON Lines file in the order they were written.
+
+    A last line left incomplete by an interrupted write is skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def read_state_log(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read a state log into {trade_date: state}, the last entry for a date wins."""
+    return {entry["trade_date"]: entry for entry in iter_state_log(path)}
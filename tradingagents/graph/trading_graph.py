@@ -1,10 +1,12 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
-from pathlib import Path
-import json
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Iterable, Iterator
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -14,7 +16,8 @@ from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.embeddings import create_embedder
+from tradingagents.agents.utils.memory import EmbeddingCache, FinancialSituationMemory
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -27,6 +30,9 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .state_log import append_state, state_log_path
+from .result_cache import ResultCache
+from .llm_cache import get_llm_cache
 
 
 class TradingAgentsGraph:
@@ -57,27 +63,38 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
+        # Optional on-disk cache of LLM responses, shared by both models
+        llm_cache_dir = self.config.get("llm_cache_dir")
+        self.llm_cache = (
+            get_llm_cache(llm_cache_dir, self.config.get("llm_cache_max_entries", 50000))
+            if llm_cache_dir
+            else None
+        )
+
         # Initialize LLMs
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache)
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
         self.toolkit = Toolkit(config=self.config)
 
-        # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
+        # Initialize memories, sharing one embedder and one embedding cache so the
+        # situation all of them are queried with is embedded once per run
+        self.embedder = create_embedder(self.config)
+        self.embedding_cache = EmbeddingCache()
+        self.bull_memory = FinancialSituationMemory("bull_memory", self.config, self.embedding_cache, self.embedder)
+        self.bear_memory = FinancialSituationMemory("bear_memory", self.config, self.embedding_cache, self.embedder)
+        self.trader_memory = FinancialSituationMemory("trader_memory", self.config, self.embedding_cache, self.embedder)
+        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config, self.embedding_cache, self.embedder)
+        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config, self.embedding_cache, self.embedder)
 
         # Create tool nodes
         self.tool_nodes = self._create_tool_nodes()
@@ -104,10 +121,21 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        # (ticker, date) to full state dict, only the most recent entries are kept
+        self.log_states_dict = OrderedDict()
+        self.log_retention = self.config.get("state_log_retention", 32)
+        self._log_lock = threading.Lock()
+
+        # Cache of finished runs
+        self.selected_analysts = list(selected_analysts)
+        result_cache_dir = self.config.get("result_cache_dir")
+        self.result_cache = ResultCache(result_cache_dir) if result_cache_dir else None
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -154,44 +182,195 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(self, company_name, trade_date, force_refresh=False):
+        """Run the trading agents graph for a company on a specific date.
+
+        A run already cached for the same ticker, date, analysts, models and
+        prompts is returned without running the graph unless force_refresh.
+        """
+
+        self.ticker = company_name
+
+        key = self.result_key(company_name, trade_date)
+        cached = None if force_refresh else self.get_cached_run(key)
+        if cached is not None:
+            self.curr_state = cached[0]
+            return cached
+
+        final_state = self._run_graph(company_name, trade_date)
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Return decision and processed signal
+        decision = self.process_signal(final_state["final_trade_decision"])
+        self._record_run(key, trade_date, final_state, decision)
+        return final_state, decision
+
+    def propagate_many(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        max_concurrency: int = 4,
+        return_exceptions: bool = False,
+        force_refresh: bool = False,
+    ) -> Iterator[Tuple[str, str, Any]]:
+        """Run the graph for many (company, date) pairs concurrently on this graph.
+
+        Every run shares the compiled graph, LLM clients and memories. Yields
+        (company_name, trade_date, (final_state, decision)) as each run
+        completes. A failed run raises, or with return_exceptions the exception
+        is yielded in place of the result. curr_state is left untouched, pass
+        the yielded state to reflect_and_remember instead.
+        """
+
+        def run(company_name, trade_date):
+            key = self.result_key(company_name, trade_date)
+            cached = None if force_refresh else self.get_cached_run(key)
+            if cached is not None:
+                return cached
+            final_state = self._run_graph(company_name, trade_date)
+            decision = self.process_signal(final_state["final_trade_decision"])
+            self._record_run(key, trade_date, final_state, decision)
+            return final_state, decision
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        futures = {
+            executor.submit(run, company_name, trade_date): (company_name, trade_date)
+            for company_name, trade_date in pairs
+        }
+        try:
+            for future in as_completed(futures):
+                company_name, trade_date = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    result = e
+                yield company_name, trade_date, result
+        finally:
+            # stop queued runs when the caller stops early or a run failed
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    async def apropagate(self, company_name, trade_date, force_refresh=False):
+        """Async version of propagate for driving many analyses from one event loop.
+
+        The graph runs with ainvoke (astream in debug mode): agent nodes await
+        their LLM calls, while memory lookups, tool data loaders and the state
+        log run in the default executor.
+        """
 
         self.ticker = company_name
+        loop = asyncio.get_running_loop()
+
+        key = await loop.run_in_executor(None, self.result_key, company_name, trade_date)
+        cached = None
+        if not force_refresh:
+            cached = await loop.run_in_executor(None, self.get_cached_run, key)
+        if cached is not None:
+            self.curr_state = cached[0]
+            return cached
+
+        final_state = await self._arun_graph(company_name, trade_date)
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Return decision and processed signal
+        decision = await self.signal_processor.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+        await loop.run_in_executor(
+            None, self._record_run, key, trade_date, final_state, decision
+        )
+        return final_state, decision
+
+    def result_key(self, company_name, trade_date):
+        """Result cache key of a run with the current config, prompts and memories.
+
+        Returns None when the result cache is disabled. Take the key before the
+        run starts, so lessons added while it runs do not change where it is stored.
+        """
+        if self.result_cache is None:
+            return None
+        memory_state = {
+            memory.collection_name: memory.fingerprint()
+            for memory in (
+                self.bull_memory,
+                self.bear_memory,
+                self.trader_memory,
+                self.invest_judge_memory,
+                self.risk_manager_memory,
+            )
+        }
+        return ResultCache.key(
+            company_name, trade_date, self.selected_analysts, self.config, memory_state
+        )
 
-        # Initialize state
+    def get_cached_run(self, key):
+        """Return the (final_state, decision) cached under a result_key, or None."""
+        if key is None:
+            return None
+        return self.result_cache.get(key)
+
+    def cache_run(self, key, final_state, decision):
+        """Store a finished run under its result_key, a None key is ignored."""
+        if key is not None:
+            self.result_cache.put(key, final_state, decision)
+
+    def _record_run(self, key, trade_date, final_state, decision):
+        """Log the final state of a finished run and cache its result."""
+        self._log_state(trade_date, final_state)
+        self.cache_run(key, final_state, decision)
+
+    def _graph_input(self, company_name, trade_date):
+        """Initial state and graph arguments of one run, shared by the sync and async paths."""
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        return init_agent_state, self.propagator.get_graph_args()
+
+    @staticmethod
+    def _trace_chunk(trace, chunk):
+        # debug mode prints and keeps every chunk that carries a message
+        if len(chunk["messages"]) > 0:
+            chunk["messages"][-1].pretty_print()
+            trace.append(chunk)
+
+    def _run_graph(self, company_name, trade_date):
+        """Run the compiled graph once and return its final state."""
+        init_agent_state, args = self._graph_input(company_name, trade_date)
 
         if self.debug:
             # Debug mode with tracing
             trace = []
             for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
+                self._trace_chunk(trace, chunk)
+            return trace[-1]
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+        # Standard mode without tracing
+        return self.graph.invoke(init_agent_state, **args)
 
-        # Store current state for reflection
-        self.curr_state = final_state
+    async def _arun_graph(self, company_name, trade_date):
+        """Async version of _run_graph."""
+        init_agent_state, args = self._graph_input(company_name, trade_date)
 
-        # Log state
-        self._log_state(trade_date, final_state)
+        if self.debug:
+            # Debug mode with tracing
+            trace = []
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                self._trace_chunk(trace, chunk)
+            return trace[-1]
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        # Standard mode without tracing
+        return await self.graph.ainvoke(init_agent_state, **args)
 
     def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        """Append the final state to the ticker's JSON Lines state log."""
+        ticker = final_state["company_of_interest"]
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -221,32 +400,31 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+        with self._log_lock:
+            key = (ticker, str(trade_date))
+            self.log_states_dict.pop(key, None)
+            self.log_states_dict[key] = entry
+            while len(self.log_states_dict) > self.log_retention:
+                self.log_states_dict.popitem(last=False)
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        # Save to file, one line per step
+        append_state(state_log_path(ticker), entry)
 
-    def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+    def reflect_and_remember(self, returns_losses, state=None):
+        """Reflect on decisions and update memory based on returns.
+
+        Reflects on state when given, otherwise on the last propagated state.
+        """
+        self.reflector.reflect_all(
+            state if state is not None else self.curr_state,
+            returns_losses,
+            {
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            },
         )
 
     def process_signal(self, full_signal):